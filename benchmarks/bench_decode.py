@@ -0,0 +1,46 @@
+"""Compare JSON decode and encode time across the available backends.
+
+Usage::
+
+    python -m benchmarks.bench_decode [recorded-page.json ...]
+
+Without arguments, ten synthetic 100-plugin pages are used.
+"""
+
+from __future__ import annotations
+
+import sys
+import timeit
+
+from benchmarks.fixtures import load_pages
+from tap_wordpress_org.client import JSON_BACKENDS, get_json_backend
+
+
+def main(argv: list) -> None:
+    """Run the benchmark and print per-backend timings."""
+    pages = load_pages(argv)
+    total_bytes = sum(len(page) for page in pages)
+    print(f"{len(pages)} pages, {total_bytes / 1_000_000:.1f} MB")
+
+    seen = set()
+    for name in JSON_BACKENDS:
+        backend = get_json_backend(name)
+        if backend.name in seen:
+            continue
+        seen.add(backend.name)
+
+        decoded = [backend.loads(page) for page in pages]
+        records = [record for page in decoded for record in page["plugins"]]
+        decode = min(timeit.repeat(lambda: [backend.loads(p) for p in pages], number=1))
+        encode = min(
+            timeit.repeat(lambda: [backend.dumps(r) for r in records], number=1)
+        )
+        print(
+            f"{backend.name:>8}: decode {decode * 1000:8.1f} ms "
+            f"({total_bytes / decode / 1_000_000:6.1f} MB/s), "
+            f"encode {encode * 1000:8.1f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,107 @@
+"""Benchmark HTML entity decoding of plugin text fields.
+
+Usage::
+
+    python -m benchmarks.bench_entities [records]
+
+Decodes the default fields, and ``sections`` as well, of 60k synthetic plugin
+records unless another record count is given.
+"""
+
+from __future__ import annotations
+
+import html
+import random
+import sys
+import timeit
+
+from benchmarks.fixtures import SECTION_HTML
+from tap_wordpress_org.transforms import DEFAULT_ENTITY_FIELDS, decode_entities
+
+
+def make_records(count: int) -> list:
+    """Return plugin records carrying only the text fields being decoded."""
+    rng = random.Random(0)
+    records = []
+    for index in range(count):
+        escaped = rng.random() < 0.3
+        records.append(
+            {
+                "name": (
+                    f"Plugin {index} &#8211; Tools &amp; More"
+                    if escaped
+                    else f"Plugin {index}"
+                ),
+                "short_description": (
+                    "Short description &amp; summary &#8211; here"
+                    if escaped
+                    else "Short description and summary"
+                ),
+                "author": f'<a href="https://profiles.wordpress.org/a{index}/">A</a>',
+                "sections": {"description": SECTION_HTML * 3, "faq": ""},
+            }
+        )
+    return records
+
+
+def legacy_decode(records: list) -> None:
+    """Reproduce the former chained replace of two entities."""
+    for row in records:
+        for field in ("name", "short_description"):
+            if row.get(field):
+                row[field] = row[field].replace("&#8211;", "–").replace("&amp;", "&")
+
+
+def unescape_all(records: list, fields: tuple) -> None:
+    """Decode with html.unescape on every string, without the fast path."""
+
+    def unescape(value):
+        if isinstance(value, str):
+            return html.unescape(value)
+        if isinstance(value, dict):
+            return {key: unescape(item) for key, item in value.items()}
+        return value
+
+    for row in records:
+        for field in fields:
+            if row.get(field):
+                row[field] = unescape(row[field])
+
+
+def decode(records: list, fields: tuple) -> None:
+    """Decode with the shared transform used by the streams."""
+    for row in records:
+        for field in fields:
+            if row.get(field):
+                row[field] = decode_entities(row[field])
+
+
+def best_of(func, count: int, *args) -> float:
+    """Return the best time of a few runs, each on fresh records."""
+    timings = []
+    for _ in range(3):
+        records = make_records(count)
+        timings.append(timeit.timeit(lambda: func(records, *args), number=1))
+    return min(timings)
+
+
+def main(argv: list) -> None:
+    """Run the benchmark and print timings."""
+    count = int(argv[0]) if argv else 60_000
+    with_sections = DEFAULT_ENTITY_FIELDS + ("sections",)
+
+    print(f"{count} records")
+    timings = [
+        ("legacy replace (name, short_description)", legacy_decode, ()),
+        ("unescape every string (defaults)", unescape_all, (DEFAULT_ENTITY_FIELDS,)),
+        ("decode_entities (defaults)", decode, (DEFAULT_ENTITY_FIELDS,)),
+        ("unescape every string (+ sections)", unescape_all, (with_sections,)),
+        ("decode_entities (+ sections)", decode, (with_sections,)),
+    ]
+    for label, func, args in timings:
+        elapsed = best_of(func, count, *args)
+        print(f"  {label:44} {elapsed * 1000:9.2f} ms")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,63 @@
+"""Benchmark the stats parsing engine on a synthetic 10k-key payload.
+
+Usage::
+
+    python -m benchmarks.bench_stats [keys]
+"""
+
+from __future__ import annotations
+
+import sys
+import timeit
+
+from tap_wordpress_org.client import iter_stats_records
+
+
+def legacy_parse(data: dict) -> list:
+    """Reproduce the former per-stream parser, which re-summed every row."""
+    records = []
+    for version, count in data.items():
+        records.append(
+            {
+                "version": version,
+                "count": int(count),
+                "percent": (
+                    float(count) / sum(int(v) for v in data.values()) * 100
+                    if data
+                    else 0
+                ),
+            }
+        )
+    return records
+
+
+def main(argv: list) -> None:
+    """Run the benchmark and print timings."""
+    keys = int(argv[0]) if argv else 10_000
+    flat = {f"{i // 100}.{i % 100}": str(i * 7 % 9973 + 1) for i in range(keys)}
+    nested = {
+        f"{major}": {
+            key: value for key, value in flat.items() if key.startswith(f"{major}.")
+        }
+        for major in range(keys // 100 + 1)
+    }
+
+    flat_time = min(
+        timeit.repeat(lambda: list(iter_stats_records(flat, "version")), number=1)
+    )
+    nested_time = min(
+        timeit.repeat(lambda: list(iter_stats_records(nested, "version")), number=1)
+    )
+    # The quadratic legacy parser takes tens of seconds at 10k keys
+    legacy_keys = min(keys, 2_000)
+    legacy_data = dict(list(flat.items())[:legacy_keys])
+    legacy_time = timeit.timeit(lambda: legacy_parse(legacy_data), number=1)
+
+    print(f"{keys} keys")
+    print(f"  engine (flat):   {flat_time * 1000:10.2f} ms")
+    print(f"  engine (nested): {nested_time * 1000:10.2f} ms")
+    print(f"  legacy (flat):   {legacy_time * 1000:10.2f} ms ({legacy_keys} keys)")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
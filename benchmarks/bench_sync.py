@@ -0,0 +1,322 @@
+"""Benchmark full syncs of each stream against a local mock API.
+
+Usage::
+
+    python -m benchmarks.bench_sync [--scale 0.1] [--streams plugins themes]
+        [--concurrency 4] [--save-baseline FILE] [--baseline FILE]
+        [--threshold 0.2]
+
+A local server serves synthetic pages sized like production (60k plugins,
+13k themes, 5k patterns and the four stats maps), scaled by ``--scale``.
+Each stream is synced by ``TapWordPressOrg`` in a fresh process, which
+reports records/s, response bytes/s, peak RSS and the time spent in each
+stage. Stage times are summed over threads, so they can exceed the wall
+time when pages are fetched concurrently.
+
+With ``--baseline``, the run fails when a stream's records/s drops more than
+``--threshold`` below the saved baseline.
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import json
+import logging
+import math
+import multiprocessing
+import random
+import resource
+import sys
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from benchmarks.fixtures import make_pattern, make_plugin, make_stats, make_theme
+
+#: Records served per stream at --scale 1
+PRODUCTION_SIZES = {"plugins": 60_000, "themes": 13_000, "patterns": 5_000}
+
+#: Keys of each stats map, by stream name and endpoint
+STATS_SIZES = {
+    "wordpress_stats": ("wordpress", 400),
+    "php_stats": ("php", 60),
+    "mysql_stats": ("mysql", 80),
+    "locale_stats": ("locale", 200),
+}
+
+STREAMS = list(PRODUCTION_SIZES) + list(STATS_SIZES)
+
+#: Stages timed during a sync, and the stream methods they wrap
+STAGES = {"http": "_send", "decode": "response_json", "post_process": "post_process"}
+
+# Distinct records generated per stream, reused to fill every page
+_POOL_SIZE = 2_000
+
+
+class MockAPI:
+    """Synthetic WordPress.org API responses, built from pre-encoded records."""
+
+    def __init__(self, scale: float, seed: int = 0):
+        rng = random.Random(seed)
+        self.totals = {
+            name: max(int(size * scale), 1) for name, size in PRODUCTION_SIZES.items()
+        }
+        factories: Dict[str, Callable[[int, random.Random], Dict[str, Any]]] = {
+            "plugins": make_plugin,
+            "themes": make_theme,
+            "patterns": make_pattern,
+        }
+        self.pools = {
+            name: [
+                json.dumps(factory(index, rng)).encode()
+                for index in range(min(_POOL_SIZE, self.totals[name]))
+            ]
+            for name, factory in factories.items()
+        }
+        self.stats = {
+            f"/stats/{endpoint}/1.0/": json.dumps(make_stats(keys)).encode()
+            for endpoint, keys in STATS_SIZES.values()
+        }
+
+    def _records(self, name: str, start: int, count: int) -> bytes:
+        pool = self.pools[name]
+        count = max(min(count, self.totals[name] - start), 0)
+        return b"[" + b",".join(pool[i % len(pool)] for i in range(count)) + b"]"
+
+    def _info_page(self, name: str, page: int, per_page: int) -> bytes:
+        total = self.totals[name]
+        info = {"page": page, "pages": math.ceil(total / per_page), "results": total}
+        records = self._records(name, (page - 1) * per_page, per_page)
+        return b'{"info":%s,"%s":%s}' % (
+            json.dumps(info).encode(),
+            name.encode(),
+            records,
+        )
+
+    def respond(self, url: str) -> Tuple[int, Dict[str, str], bytes]:
+        """Return the status, headers and body of a GET request."""
+        parts = urlsplit(url)
+        query = {key: values[0] for key, values in parse_qs(parts.query).items()}
+        headers = {"Content-Type": "application/json"}
+        if parts.path == "/plugins/info/1.2/":
+            page, per_page = int(query.get("page", 1)), int(query["per_page"])
+            return 200, headers, self._info_page("plugins", page, per_page)
+        if parts.path == "/themes/info/1.2/":
+            page = int(query.get("request[page]", 1))
+            per_page = int(query["request[per_page]"])
+            return 200, headers, self._info_page("themes", page, per_page)
+        if parts.path == "/patterns/1.0/":
+            offset, per_page = int(query.get("offset", 0)), int(query["per_page"])
+            headers["X-WP-Total"] = str(self.totals["patterns"])
+            records = self._records("patterns", offset, per_page)
+            return 200, headers, b'{"patterns":' + records + b"}"
+        if parts.path in self.stats:
+            return 200, headers, self.stats[parts.path]
+        return 404, headers, b"{}"
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    api: MockAPI
+
+    def do_GET(self):
+        status, headers, body = self.api.respond(self.path)
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@contextlib.contextmanager
+def serve(api: MockAPI) -> Iterator[str]:
+    """Serve the mock API on a local port, yielding its URL."""
+    handler = type("Handler", (_Handler,), {"api": api})
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_port}"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+class _CountingSink:
+    """Stand-in stdout counting the bytes of the Singer messages written."""
+
+    def __init__(self):
+        self.bytes = 0
+
+    def write(self, text: str) -> int:
+        self.bytes += len(text)
+        return len(text)
+
+    def flush(self) -> None:
+        pass
+
+
+def _timed(func: Callable, stage: str, timings: Dict[str, float], lock) -> Callable:
+    """Wrap a function, adding its run time to the stage total."""
+
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            elapsed = time.perf_counter() - start
+            with lock:
+                timings[stage] += elapsed
+
+    return wrapper
+
+
+def run_stream(api_url: str, stream_name: str, concurrency: int) -> Dict[str, Any]:
+    """Sync one stream and return its throughput, memory and stage timings."""
+    from tap_wordpress_org.tap import TapWordPressOrg
+
+    # Schema mismatch warnings of the synthetic records are expected
+    logging.disable(logging.WARNING)
+    tap = TapWordPressOrg(
+        config={
+            "api_url": api_url,
+            "stream_selection": [stream_name],
+            "requests_per_second": 0,
+            "max_concurrency": concurrency,
+        }
+    )
+    timings: Dict[str, float] = defaultdict(float)
+    counts = {"records": 0, "response_bytes": 0}
+    lock = threading.Lock()
+    for stream in tap.streams.values():
+        for stage, method in STAGES.items():
+            setattr(
+                stream, method, _timed(getattr(stream, method), stage, timings, lock)
+            )
+
+        send = stream._send
+
+        def count_send(*args, _send=send, **kwargs):
+            response = _send(*args, **kwargs)
+            with lock:
+                counts["response_bytes"] += len(response.content)
+            return response
+
+        stream._send = count_send
+
+    writer = tap.message_writer
+    format_message = _timed(writer.format_message, "serialize", timings, lock)
+
+    def count_format(message):
+        if message.type == "RECORD":
+            counts["records"] += 1
+        return format_message(message)
+
+    writer.format_message = count_format
+
+    sink = _CountingSink()
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(sink):
+        tap.sync_streams()
+    wall = time.perf_counter() - start
+
+    return {
+        "records": counts["records"],
+        "wall_s": wall,
+        "records_per_s": counts["records"] / wall if wall else 0.0,
+        "response_bytes_per_s": counts["response_bytes"] / wall if wall else 0.0,
+        "output_bytes": sink.bytes,
+        # ru_maxrss is in kilobytes on Linux, bytes on macOS
+        "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        / (1024 * 1024 if sys.platform == "darwin" else 1024),
+        "stages_s": {stage: timings[stage] for stage in (*STAGES, "serialize")},
+    }
+
+
+def run_isolated(api_url: str, stream_name: str, concurrency: int) -> Dict[str, Any]:
+    """Run one stream benchmark in a fresh process, for a clean peak RSS."""
+    # Workers exit on their own rather than on SIGTERM, which makes the tap
+    # write a final STATE message
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+        return executor.submit(run_stream, api_url, stream_name, concurrency).result()
+
+
+def find_regressions(
+    results: Dict[str, dict], baseline: Dict[str, dict], threshold: float
+) -> List[str]:
+    """Return the streams whose records/s fell more than threshold below baseline."""
+    regressions = []
+    for name, result in results.items():
+        expected = baseline.get(name, {}).get("records_per_s")
+        if expected and result["records_per_s"] < expected * (1 - threshold):
+            regressions.append(
+                f"{name}: {result['records_per_s']:.0f} records/s, "
+                f"baseline {expected:.0f} records/s"
+            )
+    return regressions
+
+
+def print_result(name: str, result: Dict[str, Any]) -> None:
+    """Print one stream's benchmark result."""
+    stages = ", ".join(
+        f"{stage} {seconds * 1000:.0f} ms"
+        for stage, seconds in result["stages_s"].items()
+    )
+    print(
+        f"  {name:16} {result['records']:7} records in {result['wall_s']:7.2f} s  "
+        f"{result['records_per_s']:9.0f} rec/s  "
+        f"{result['response_bytes_per_s'] / 1_000_000:7.1f} MB/s  "
+        f"peak RSS {result['peak_rss_mb']:6.0f} MB"
+    )
+    print(f"  {'':16} {stages}")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Run the benchmark, returning a non-zero exit code on regressions."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scale", type=float, default=1.0)
+    parser.add_argument("--streams", nargs="+", choices=STREAMS, default=STREAMS)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--baseline", help="JSON results to compare against")
+    parser.add_argument("--save-baseline", help="write the results to this file")
+    parser.add_argument("--threshold", type=float, default=0.2)
+    args = parser.parse_args(argv)
+
+    print(f"Building fixtures at scale {args.scale}")
+    api = MockAPI(args.scale)
+    results = {}
+    with serve(api) as api_url:
+        run = partial(run_isolated, api_url, concurrency=args.concurrency)
+        for name in args.streams:
+            results[name] = run(name)
+            print_result(name, results[name])
+
+    if args.save_baseline:
+        with open(args.save_baseline, "w") as baseline_file:
+            json.dump(results, baseline_file, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as baseline_file:
+            regressions = find_regressions(
+                results, json.load(baseline_file), args.threshold
+            )
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,138 @@
+"""Synthetic API payloads shaped like WordPress.org responses."""
+
+from __future__ import annotations
+
+import json
+import random
+from pathlib import Path
+from typing import Any, Dict, List
+
+SECTION_HTML = (
+    "<p>Lorem ipsum &amp; dolor sit amet &#8211; consectetur adipiscing elit. "
+    "Sed do eiusmod tempor incididunt ut labore et dolore magna aliqua.</p>\n"
+)
+
+
+def make_plugin(index: int, rng: random.Random) -> Dict[str, Any]:
+    """Return one plugin record with the default heavy field set."""
+    slug = f"plugin-{index}"
+    versions = {
+        f"{major}.{minor}": f"https://downloads.wordpress.org/plugin/{slug}.zip"
+        for major in range(1, 4)
+        for minor in range(rng.randint(1, 12))
+    }
+    return {
+        "name": f"Plugin {index} &#8211; Tools &amp; More",
+        "slug": slug,
+        "version": "3.1.0",
+        "author": f'<a href="https://profiles.wordpress.org/a{index}/">A{index}</a>',
+        "author_profile": f"https://profiles.wordpress.org/a{index}/",
+        "contributors": {
+            f"a{index}": {
+                "profile": f"https://profiles.wordpress.org/a{index}/",
+                "avatar": "https://secure.gravatar.com/avatar/0",
+                "display_name": f"A{index}",
+            }
+        },
+        "requires": "5.0",
+        "tested": "6.5",
+        "requires_php": rng.choice(["7.4", "8.0", False]),
+        "rating": rng.randint(0, 100),
+        "ratings": {str(star): rng.randint(0, 500) for star in range(1, 6)},
+        "num_ratings": rng.randint(0, 2500),
+        "active_installs": rng.choice([0, 10, 1000, 100000, 1000000]),
+        "downloaded": rng.randint(0, 10_000_000),
+        "last_updated": "2024-01-01 3:45pm GMT",
+        "added": "2015-06-01",
+        "homepage": f"https://example.com/{slug}",
+        "sections": {
+            "description": SECTION_HTML * rng.randint(5, 30),
+            "installation": SECTION_HTML * rng.randint(1, 5),
+            "faq": SECTION_HTML * rng.randint(0, 10),
+            "changelog": SECTION_HTML * rng.randint(5, 40),
+        },
+        "short_description": "Short description &amp; summary &#8211; here",
+        "tags": {f"tag-{t}": f"Tag {t}" for t in range(rng.randint(1, 5))},
+        "versions": versions,
+        "donate_link": "",
+        "download_link": f"https://downloads.wordpress.org/plugin/{slug}.zip",
+    }
+
+
+def make_plugin_page(
+    page: int, pages: int, per_page: int = 100, seed: int = 0
+) -> Dict[str, Any]:
+    """Return one ``query_plugins`` page."""
+    rng = random.Random(seed + page)
+    start = (page - 1) * per_page
+    plugins: List[Dict[str, Any]] = [
+        make_plugin(start + i, rng) for i in range(per_page)
+    ]
+    return {
+        "info": {"page": page, "pages": pages, "results": pages * per_page},
+        "plugins": plugins,
+    }
+
+
+def make_theme(index: int, rng: random.Random) -> Dict[str, Any]:
+    """Return one theme record with the default ``query_themes`` fields."""
+    slug = f"theme-{index}"
+    return {
+        "name": f"Theme {index} &#8211; Blocks &amp; Style",
+        "slug": slug,
+        "version": "1.4.2",
+        "preview_url": f"https://wp-themes.com/{slug}/",
+        "author": {
+            "user_nicename": f"a{index}",
+            "profile": f"https://profiles.wordpress.org/a{index}/",
+            "display_name": f"A{index}",
+        },
+        "screenshot_url": f"//ts.w.org/wp-content/themes/{slug}/screenshot.png",
+        "rating": rng.randint(0, 100),
+        "num_ratings": rng.randint(0, 500),
+        "downloaded": rng.randint(0, 1_000_000),
+        "last_updated": "2024-01-01",
+        "last_updated_time": "2024-01-01 12:00:00",
+        "homepage": f"https://wordpress.org/themes/{slug}/",
+        "sections": {"description": SECTION_HTML * rng.randint(1, 5)},
+        "tags": {f"tag-{t}": f"Tag {t}" for t in range(rng.randint(3, 12))},
+        "download_link": f"https://downloads.wordpress.org/theme/{slug}.zip",
+        "requires": "6.0",
+        "requires_php": rng.choice(["7.4", "8.0", False]),
+    }
+
+
+def make_pattern(index: int, rng: random.Random) -> Dict[str, Any]:
+    """Return one block pattern record."""
+    markup = "<!-- wp:paragraph --><p>Pattern text</p><!-- /wp:paragraph -->"
+    return {
+        "id": index,
+        "title": {"raw": f"Pattern {index}", "rendered": f"Pattern {index}"},
+        "content": {
+            "raw": markup * rng.randint(5, 40),
+            "rendered": markup * rng.randint(5, 40),
+        },
+        "categories": [rng.randint(1, 30) for _ in range(rng.randint(1, 3))],
+        "keywords": [rng.randint(1, 300) for _ in range(rng.randint(0, 6))],
+        "pattern_meta": {"viewport_width": 1200},
+        "category_slugs": ["featured", "text"],
+        "keyword_slugs": ["hero", "cover"],
+        "meta": {
+            "author_name": f"A{index}",
+            "author_username": f"a{index}",
+            "is_web_only": False,
+        },
+    }
+
+
+def make_stats(keys: int, seed: int = 0) -> Dict[str, str]:
+    """Return a stats map of version to install count."""
+    rng = random.Random(seed)
+    return {f"{i // 10}.{i % 10}": str(rng.randint(1, 1_000_000)) for i in range(keys)}
+
+
+def load_pages(paths: List[str]) -> List[bytes]:
+    """Return recorded response bodies, or synthetic pages when none given."""
+    if paths:
+        return [Path(path).read_bytes() for path in paths]
+    return [json.dumps(make_plugin_page(page, 10)).encode() for page in range(1, 11)]
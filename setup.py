@@ -7,9 +7,14 @@ setup(
     author="Your Name",
     packages=find_packages(),
     install_requires=[
-        "singer-sdk>=0.47.0",
+        "singer-sdk~=0.47.4",
         "requests>=2.31.0",
     ],
+    extras_require={
+        "orjson": ["orjson>=3.8"],
+        "msgspec": ["msgspec>=0.18"],
+        "ijson": ["ijson>=3.1"],
+    },
     entry_points={
         "console_scripts": [
             "tap-wordpress-org=tap_wordpress_org.tap:TapWordPressOrg.cli",
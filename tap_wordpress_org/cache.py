@@ -0,0 +1,177 @@
+"""Persistent HTTP response cache for the WordPress.org API."""
+
+from __future__ import annotations
+
+import json
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+# Validators plus the headers streams read pagination totals from
+STORED_HEADERS = (
+    "ETag",
+    "Last-Modified",
+    "Content-Type",
+    "X-WP-Total",
+    "X-WP-TotalPages",
+)
+
+
+@dataclass
+class CachedResponse:
+    """A response body and its validators as stored in the cache."""
+
+    status_code: int
+    headers: Dict[str, str]
+    body: bytes
+    stored_at: float
+
+    @property
+    def age(self) -> float:
+        """Return the number of seconds since the entry was (re)validated."""
+        return time.time() - self.stored_at
+
+    def conditional_headers(self) -> Dict[str, str]:
+        """Return the headers needed to revalidate this entry."""
+        headers = {}
+        if self.headers.get("ETag"):
+            headers["If-None-Match"] = self.headers["ETag"]
+        if self.headers.get("Last-Modified"):
+            headers["If-Modified-Since"] = self.headers["Last-Modified"]
+        return headers
+
+    def to_response(
+        self, prepared_request: requests.PreparedRequest
+    ) -> requests.Response:
+        """Build a requests.Response serving this entry."""
+        response = requests.Response()
+        response.status_code = self.status_code
+        response.headers = CaseInsensitiveDict(self.headers)
+        response._content = self.body
+        response.url = prepared_request.url or ""
+        response.request = prepared_request
+        response.reason = "OK"
+        return response
+
+
+class HTTPResponseCache:
+    """SQLite-backed response cache keyed by request method and URL.
+
+    Entries are evicted least recently used first once the stored bodies
+    exceed ``max_size_bytes``.
+    """
+
+    def __init__(self, path: str, max_size_bytes: int = 512 * 1024 * 1024):
+        self.path = path
+        self.max_size_bytes = max_size_bytes
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.execute(
+            """
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                status_code INTEGER NOT NULL,
+                headers TEXT NOT NULL,
+                body BLOB NOT NULL,
+                size INTEGER NOT NULL,
+                stored_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+            """
+        )
+        self._connection.commit()
+
+    @classmethod
+    def from_config(cls, config: dict) -> Optional["HTTPResponseCache"]:
+        """Build a cache from tap settings, or None when caching is disabled."""
+        path = config.get("http_cache_path")
+        if not path:
+            return None
+        max_size_mb = config.get("http_cache_max_size_mb", 512)
+        return cls(path, max_size_bytes=int(max_size_mb * 1024 * 1024))
+
+    @staticmethod
+    def key_for(prepared_request: requests.PreparedRequest) -> str:
+        """Return the cache key of a request."""
+        return f"{prepared_request.method} {prepared_request.url}"
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        """Return the cached entry for a key, if any."""
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT status_code, headers, body, stored_at FROM responses "
+                "WHERE key = ?",
+                (key,),
+            ).fetchone()
+            if row is None:
+                return None
+            self._connection.execute(
+                "UPDATE responses SET accessed_at = ? WHERE key = ?",
+                (time.time(), key),
+            )
+            self._connection.commit()
+
+        status_code, headers, body, stored_at = row
+        return CachedResponse(status_code, json.loads(headers), body, stored_at)
+
+    def store(self, key: str, response: requests.Response) -> None:
+        """Store a successful response."""
+        headers = {
+            name: response.headers[name]
+            for name in STORED_HEADERS
+            if name in response.headers
+        }
+        body = response.content
+        now = time.time()
+        with self._lock:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    key,
+                    response.status_code,
+                    json.dumps(headers),
+                    body,
+                    len(body),
+                    now,
+                    now,
+                ),
+            )
+            self._evict()
+            self._connection.commit()
+
+    def revalidated(self, key: str) -> None:
+        """Mark an entry as fresh after a 304 Not Modified response."""
+        now = time.time()
+        with self._lock:
+            self._connection.execute(
+                "UPDATE responses SET stored_at = ?, accessed_at = ? WHERE key = ?",
+                (now, now, key),
+            )
+            self._connection.commit()
+
+    def _evict(self) -> None:
+        """Drop least recently used entries until the cache fits its budget."""
+        (total_size,) = self._connection.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM responses"
+        ).fetchone()
+        if total_size <= self.max_size_bytes:
+            return
+
+        rows = self._connection.execute(
+            "SELECT key, size FROM responses ORDER BY accessed_at ASC"
+        ).fetchall()
+        for key, size in rows:
+            if total_size <= self.max_size_bytes:
+                break
+            self._connection.execute("DELETE FROM responses WHERE key = ?", (key,))
+            total_size -= size
+
+    def close(self) -> None:
+        """Close the underlying database."""
+        with self._lock:
+            self._connection.close()
@@ -2,19 +2,419 @@
 
 from __future__ import annotations
 
+import decimal
+import json
+import re
+import threading
 import time
-from typing import Any, Dict, Iterator, Optional
+import weakref
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime, timezone
+from itertools import islice
+from typing import (
+    Any,
+    Callable,
+    Deque,
+    Dict,
+    FrozenSet,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+)
 
+import requests
+from singer_sdk import metrics
 from singer_sdk.helpers.jsonpath import extract_jsonpath
+from singer_sdk.pagination import LegacyStreamPaginator
+from singer_sdk.singerlib.json import serialize_json
 from singer_sdk.streams import RESTStream
 
+from tap_wordpress_org.cache import HTTPResponseCache
+from tap_wordpress_org.fingerprints import FingerprintIndex, fingerprint
+from tap_wordpress_org.instrumentation import StreamStats, timed_post_process
+from tap_wordpress_org.ratelimit import TokenBucketRateLimiter, parse_retry_after
+from tap_wordpress_org.session import create_session
+from tap_wordpress_org.transforms import (
+    DEFAULT_ENTITY_FIELDS,
+    TransformPipeline,
+    decode_fields,
+    false_to_null,
+    require_fields,
+    zero_dates_to_null,
+)
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:  # pragma: no cover
+    msgspec = None
+
+try:
+    import ijson
+    from ijson.common import ObjectBuilder
+except ImportError:  # pragma: no cover
+    ijson = None
+
+JSON_BACKENDS = ("auto", "orjson", "msgspec", "json")
+
+TIMESTAMP_FORMATS = (
+    "%Y-%m-%d %I:%M%p %Z",  # plugins, e.g. "2024-01-01 3:45pm GMT"
+    "%Y-%m-%d %H:%M:%S",  # themes, e.g. "2024-01-01 15:45:00"
+    "%Y-%m-%d",
+)
+
+
+def parse_timestamp(value: Any) -> Optional[datetime]:
+    """Parse a WordPress.org or ISO 8601 timestamp into an aware datetime."""
+    if not value or not isinstance(value, str):
+        return None
+
+    try:
+        parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        for timestamp_format in TIMESTAMP_FORMATS:
+            try:
+                parsed = datetime.strptime(value, timestamp_format)
+                break
+            except ValueError:
+                continue
+        else:
+            return None
+
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed
+
+
+def _latest_timestamp(*values: Optional[str]) -> Optional[str]:
+    """Return the value holding the latest timestamp, ignoring empty ones."""
+    latest = None
+    latest_time = None
+    for value in values:
+        value_time = parse_timestamp(value)
+        if value_time is not None and (latest_time is None or value_time > latest_time):
+            latest, latest_time = value, value_time
+    return latest
+
+
+def _encode_default(obj: Any) -> Any:
+    """Encode values the fast JSON libraries do not support natively."""
+    if isinstance(obj, decimal.Decimal):
+        return float(obj)
+    return str(obj)
+
+
+class JSONBackend:
+    """JSON backend using the standard library and the SDK serializer."""
+
+    name = "json"
+
+    def loads(self, data: bytes) -> Any:
+        """Decode a JSON document."""
+        return json.loads(data)
+
+    def dumps(self, obj: Any) -> str:
+        """Encode an object as a compact JSON string."""
+        return serialize_json(obj)
+
+
+class OrjsonBackend(JSONBackend):
+    """JSON backend using orjson."""
+
+    name = "orjson"
+
+    def loads(self, data: bytes) -> Any:
+        """Decode a JSON document."""
+        return orjson.loads(data)
+
+    def dumps(self, obj: Any) -> str:
+        """Encode an object as a compact JSON string."""
+        return orjson.dumps(
+            obj, default=_encode_default, option=orjson.OPT_NON_STR_KEYS
+        ).decode()
+
+
+class MsgspecBackend(JSONBackend):
+    """JSON backend using msgspec."""
+
+    name = "msgspec"
+
+    def __init__(self):
+        self._decoder = msgspec.json.Decoder()
+        self._encoder = msgspec.json.Encoder(
+            enc_hook=_encode_default, decimal_format="number"
+        )
+
+    def loads(self, data: bytes) -> Any:
+        """Decode a JSON document."""
+        return self._decoder.decode(data)
+
+    def dumps(self, obj: Any) -> str:
+        """Encode an object as a compact JSON string."""
+        return self._encoder.encode(obj).decode()
+
+
+_END_OF_BODY = object()
+
+
+class _ResponseReader:
+    """File-like view over a response body for incremental parsers."""
+
+    def __init__(
+        self,
+        response: Any,
+        chunk_size: int = 64 * 1024,
+        on_read: Optional[Callable[[int, float], None]] = None,
+    ):
+        self._chunks = response.iter_content(chunk_size)
+        self._on_read = on_read
+
+    def read(self, size: int = -1) -> bytes:
+        """Return the next chunk of the body, or b"" once it is exhausted."""
+        if size == 0:
+            # Parsers probe with read(0) to detect bytes or text input
+            return b""
+        start = time.perf_counter()
+        chunk = next(self._chunks, b"")
+        if chunk and self._on_read is not None:
+            self._on_read(len(chunk), time.perf_counter() - start)
+        return chunk
+
+
+def _has_unread_body(response: Any) -> bool:
+    """Return whether the response body can still be streamed from the socket.
+
+    Cached, revalidated and replayed responses carry their body in memory
+    and have no raw stream to read from.
+    """
+    return response.raw is not None and not response._content_consumed
+
+
+def iter_streamed_array(
+    response: Any,
+    array_key: str,
+    metadata: Dict[str, Any],
+    on_read: Optional[Callable[[int, float], None]] = None,
+) -> Iterator[Any]:
+    """Yield the items of a top-level array while the body is still arriving.
+
+    Every other top-level value (e.g. the ``info`` pagination block) is
+    collected into ``metadata``. ``on_read`` is called with the size of each
+    chunk of the body read and the seconds spent waiting for it.
+    """
+    item_prefix = f"{array_key}.item"
+    builder = None
+    target = None
+    depth = 0
+    events = ijson.parse(_ResponseReader(response, on_read=on_read), use_float=True)
+    for prefix, event, value in events:
+        if builder is None:
+            if prefix == item_prefix:
+                target = None
+            elif prefix and prefix != array_key and "." not in prefix:
+                target = prefix
+            else:
+                continue
+            builder = ObjectBuilder()
+            depth = 0
+
+        builder.event(event, value)
+        if event in ("start_map", "start_array"):
+            depth += 1
+        elif event in ("end_map", "end_array"):
+            depth -= 1
+        if depth:
+            continue
+
+        if target is None:
+            yield builder.value
+        else:
+            metadata[target] = builder.value
+        builder = None
+
+
+def _iter_stats_items(data: dict, group: str = "") -> Iterator[Tuple[str, str, Any]]:
+    """Yield the group, key and count of each leaf of a nested stats map."""
+    for key, value in data.items():
+        if isinstance(value, dict):
+            yield from _iter_stats_items(value, f"{group}/{key}" if group else key)
+        else:
+            yield group, key, value
+
+
+def iter_stats_records(data: Any, key_name: str) -> Iterator[dict]:
+    """Yield one count/percent record per entry of a stats response.
+
+    The stats endpoints return a map of version or locale to install count,
+    optionally grouped into nested maps. Entries of a nested map carry the
+    path of their group, so equal keys in different groups stay distinct,
+    and top-level entries have an empty group. The total is computed once,
+    so the whole response is processed in linear time.
+    """
+    if not isinstance(data, dict) or not data:
+        return
+
+    counts = [(group, key, int(count)) for group, key, count in _iter_stats_items(data)]
+    total = sum(count for _, _, count in counts)
+    for group, key, count in counts:
+        yield {
+            "group": group,
+            key_name: key,
+            "count": count,
+            "percent": count / total * 100 if total else 0,
+        }
+
+
+def get_shard(config: dict) -> Optional[Dict[str, int]]:
+    """Return the shard context configured for this worker, if sharding."""
+    shard_count = int(config.get("shard_count", 1))
+    if shard_count <= 1:
+        return None
+
+    shard_index = int(config.get("shard_index", 0))
+    if not 0 <= shard_index < shard_count:
+        raise ValueError(
+            f"shard_index must be between 0 and {shard_count - 1}, "
+            f"got {shard_index}"
+        )
+    return {"shard": shard_index, "shard_count": shard_count}
+
+
+def get_json_backend(name: str = "auto") -> JSONBackend:
+    """Return the requested JSON backend, falling back to the stdlib."""
+    if name not in JSON_BACKENDS:
+        raise ValueError(
+            f"Unknown json_backend '{name}', expected one of {JSON_BACKENDS}"
+        )
+
+    if name in ("auto", "orjson") and orjson is not None:
+        return OrjsonBackend()
+    if name in ("auto", "msgspec") and msgspec is not None:
+        return MsgspecBackend()
+    return JSONBackend()
+
+
+class ResumedPaginator(LegacyStreamPaginator):
+    """Paginator following the pages after the page a crawl resumed at."""
+
+    def __init__(self, stream: Any, start_value: Any):
+        super().__init__(stream)
+        # The SDK's paginators have no setter for their current token
+        self._value = start_value
+
 
 class WordPressOrgAPIStream(RESTStream):
     """WordPress.org API stream class."""
 
+    # Streams whose first response reports the full page range can fetch the
+    # remaining pages concurrently (see get_page_tokens).
+    parallel_pagination = False
+
+    # Streams returning records newest first by replication key can accept or
+    # drop whole pages against the bookmark (see parse_response).
+    newest_first = False
+
+    #: Seconds a cached response is served without revalidating it
+    http_cache_ttl = 0
+
+    # Streams paginated by page number can split their pages between workers
+    # (see partitions and page_step).
+    shardable = False
+
+    #: Request parameter toggling one response field, formatted with its name
+    field_param_template: Optional[str] = None
+
+    #: Fields requested even when deselected because processing depends on them
+    required_fields: Tuple[str, ...] = ()
+
+    #: Fields the listing returns unless their field parameter turns them off
+    default_fields: FrozenSet[str] = frozenset()
+
+    #: Fields a single-slug lookup returns unless turned off
+    lookup_default_fields: FrozenSet[str] = frozenset()
+
+    _ARRAY_JSONPATH = re.compile(r"^\$\.(\w+)\[\*\]$")
+
+    #: Fields a record must have, records missing one are skipped
+    required_record_fields: Tuple[str, ...] = ()
+
+    #: Whether the configured decode_entities_fields apply to the stream
+    decode_entities = False
+
+    #: Optional fields the API sets to false when empty, emitted as null
+    false_to_null_fields: Tuple[str, ...] = ()
+
+    #: Date fields whose zero value is emitted as null
+    zero_date_fields: Tuple[str, ...] = ()
+
+    #: Whether records are checked against the fingerprint index
+    change_detection = False
+
+    #: Whether records at the bookmark are emitted again, as their values may
+    #: have changed since the last sync
+    bookmark_inclusive = False
+
+    #: Setting listing slugs that are looked up one by one instead of paged
+    slug_list_setting: Optional[str] = None
+
+    # Streams with a slug_list_setting define get_lookup_params(slug), returning
+    # the URL parameters looking up a single record by slug
+    get_lookup_params: Callable[[str], Dict[str, Any]]
+
+    # Full crawls checkpoint their position in state, so an interrupted crawl
+    # resumes where it stopped (see request_records).
+    resumable_pagination = False
+
+    #: Name of the page token in the pagination cursor
+    cursor_token_name = "page"
+
+    #: Sort order of the listing, recorded in the pagination cursor
+    browse: Optional[str] = None
+
+    # Pages a resumed crawl steps back before restarting from the first page
+    _MAX_RESUME_STEPBACK = 5
+
+    # Streams may sync concurrently (see TapWordPressOrg.sync_streams) while
+    # sharing one tap state, so every state write and STATE message holds it.
+    _state_lock = threading.RLock()
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self._stop_pagination = False
+        self._decoded_responses: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+        self._decoded_responses_lock = threading.Lock()
+        self._json_backend: Optional[JSONBackend] = None
+        self._rate_limiter: Optional[TokenBucketRateLimiter] = None
+        self._http_cache: Optional[HTTPResponseCache] = None
+        self._http_cache_resolved = False
+        self._fingerprint_index: Optional[FingerprintIndex] = None
+        self._fingerprint_index_resolved = False
+        self._fingerprints: Optional[Dict[str, str]] = None
+        self._changed_fingerprints: Dict[str, str] = {}
+        self._unchanged_records = 0
+        self._bookmark_resolved = False
+        self._bookmark_context: Optional[dict] = None
+        self._bookmark: Tuple[Any, Optional[datetime]] = (None, None)
+        self._partition_context: Optional[dict] = None
+        self._page_is_newer = False
+        self._field_params: Dict[bool, Dict[str, str]] = {}
+        self._prefetched: Dict[str, Tuple[Any, Any]] = {}
+        self._pending_child_contexts: List[dict] = []
+        self._crawl_started_at: Optional[str] = None
+        self._last_page_record: Optional[dict] = None
+        self._resume_anchor: Optional[dict] = None
+        self._resumed_high_water_mark: Optional[str] = None
+        self.record_pipeline = self.build_record_pipeline()
+        self.instrumentation = StreamStats()
+        # Called by log_sync_costs, the SDK's hook at the end of the sync
+        self.on_sync_end: Optional[Callable[[WordPressOrgAPIStream], None]] = None
 
     @property
     def url_base(self) -> str:
@@ -36,38 +436,851 @@ class WordPressOrgAPIStream(RESTStream):
         params: dict = {}
         return params
 
+    def get_field_params(self, lookup: bool = False) -> Dict[str, str]:
+        """Return params requesting only the fields selected in the catalog.
+
+        Only fields whose selection differs from what the API returns by
+        default are toggled, for a listing or a single-slug ``lookup``.
+        """
+        if not self.field_param_template or not self.config.get(
+            "field_projection", False
+        ):
+            return {}
+
+        if lookup not in self._field_params:
+            defaults = self.lookup_default_fields if lookup else self.default_fields
+            required = {*self.primary_keys, *self.required_fields}
+            if self.replication_key:
+                required.add(self.replication_key)
+            params = {}
+            for name in self.schema["properties"]:
+                selected = name in required or self.mask.get(("properties", name), True)
+                if selected != (name in defaults):
+                    params[self.field_param_template.format(name)] = (
+                        "true" if selected else "false"
+                    )
+            self._field_params[lookup] = params
+        return self._field_params[lookup]
+
+    @property
+    def entity_fields(self) -> Tuple[str, ...]:
+        """Return the fields whose HTML entities are decoded."""
+        if not self.decode_entities:
+            return ()
+        return tuple(self.config.get("decode_entities_fields", DEFAULT_ENTITY_FIELDS))
+
+    def build_record_pipeline(self) -> TransformPipeline:
+        """Compile the record transformations declared by the stream."""
+        return TransformPipeline(
+            [
+                require_fields(self.required_record_fields, self._log_missing_field),
+                decode_fields(self.entity_fields),
+                false_to_null(self.false_to_null_fields),
+                zero_dates_to_null(self.zero_date_fields),
+            ]
+        )
+
+    def _log_missing_field(self, row: dict, field: str) -> None:
+        self.logger.warning(
+            f"Skipping {self.name} record missing required '{field}' field: {row}"
+        )
+
+    @timed_post_process
+    def post_process(self, row: dict, context: Optional[dict] = None) -> Optional[dict]:
+        """Transform a record, dropping it if already synced or unchanged."""
+        transformed = self.record_pipeline(row)
+        if transformed is not None:
+            transformed = self._filter_by_replication_key(transformed, context)
+        if transformed is None or not self.change_detection:
+            return transformed
+        return self._filter_unchanged(transformed)
+
+    @property
+    def json_backend(self) -> JSONBackend:
+        """Return the JSON backend used to decode response bodies."""
+        if self._json_backend is None:
+            self._json_backend = get_json_backend(
+                self.config.get("json_backend", "auto")
+            )
+        return self._json_backend
+
+    @property
+    def streaming_parse(self) -> bool:
+        """Return whether records are parsed incrementally as they arrive."""
+        return bool(
+            self.config.get("streaming_parse", False)
+            and ijson is not None
+            and self._ARRAY_JSONPATH.match(self.records_jsonpath)
+        )
+
+    @property
+    def max_concurrency(self) -> int:
+        """Return the maximum number of pages requested at the same time."""
+        return max(int(self.config.get("max_concurrency", 1)), 1)
+
+    @property
+    def partitions(self) -> Optional[List[dict]]:
+        """Return this worker's shard as the only partition when sharding."""
+        shard = get_shard(self.config) if self.shardable else None
+        if shard is not None and not self.lookup_slugs:
+            return [shard]
+        return super().partitions
+
+    @property
+    def page_step(self) -> int:
+        """Return the distance between two pages crawled by this partition."""
+        return (self._partition_context or {}).get("shard_count", 1)
+
+    def get_first_page(self, context: Optional[dict]) -> int:
+        """Return the first page crawled by a partition."""
+        return (context or {}).get("shard", 0) + 1
+
+    def get_page_tokens(self, response: Any) -> Optional[List[Any]]:
+        """Return the tokens of every page after the first one, if known."""
+        return None
+
+    def get_previous_page_token(self, token: Any) -> Optional[Any]:
+        """Return the token of the page before a page, or None on the first one."""
+        previous = token - self.page_step
+        return (
+            previous
+            if previous >= self.get_first_page(self._partition_context)
+            else None
+        )
+
+    def get_records(self, context: Optional[dict]) -> Iterator[dict]:
+        """Return records for one partition, resetting per-partition state."""
+        self._stop_pagination = False
+        self._bookmark_resolved = False
+        self._partition_context = context
+        yield from super().get_records(context)
+        if self.checkpoint_pages:
+            # The crawl is complete, so the next one starts from the top
+            with self._state_lock:
+                state = self.get_context_state(context)
+                state.pop("pagination_cursor", None)
+                if self.replication_key and self._resumed_high_water_mark:
+                    self._restore_high_water_mark(state)
+        self._flush_child_contexts()
+        self._save_fingerprints()
+
+    @property
+    def checkpoint_pages(self) -> int:
+        """Return the number of pages crawled between pagination checkpoints."""
+        if not self.resumable_pagination or self.lookup_slugs or self.streaming_parse:
+            return 0
+        return max(int(self.config.get("pagination_checkpoint_pages", 10)), 0)
+
+    def get_pagination_cursor(self, context: Optional[dict]) -> Optional[dict]:
+        """Return the checkpointed position of an interrupted crawl, if usable."""
+        cursor = self.get_context_state(context).get("pagination_cursor")
+        if not cursor or cursor.get(self.cursor_token_name) is None:
+            return None
+        if cursor.get("browse") != self.browse:
+            self.logger.info(
+                f"Ignoring {self.name} pagination cursor of another listing order"
+            )
+            return None
+        return cursor
+
+    def _checkpoint(self, context: Optional[dict], pages: int, next_token: Any) -> None:
+        """Save the position of the crawl every checkpoint_pages pages."""
+        every = self.checkpoint_pages
+        if not every or pages % every or self._last_page_record is None:
+            return
+
+        anchor = self._last_page_record
+        cursor = {
+            "browse": self.browse,
+            self.cursor_token_name: next_token,
+            "crawl_started_at": self._crawl_started_at,
+            "anchor_key": anchor.get(self.primary_keys[0]),
+            "anchor_value": (
+                anchor.get(self.replication_key) if self.replication_key else None
+            ),
+        }
+        with self._state_lock:
+            state = self.get_context_state(context)
+            if self.replication_key:
+                # The SDK resets progress markers on every run, so the newest
+                # value synced before an interruption is carried in the cursor
+                synced = state.get("progress_markers", {}).get("replication_key_value")
+                cursor["high_water_mark"] = _latest_timestamp(
+                    self._resumed_high_water_mark, synced
+                )
+            state["pagination_cursor"] = cursor
+            self._write_state_message()
+
+    def _restore_high_water_mark(self, state: dict) -> None:
+        """Bookmark the newest value of a resumed crawl, across its runs.
+
+        Records updated after the crawl started moved above the resumed pages,
+        so the bookmark is capped at the start of the crawl to sync them next.
+        """
+        markers = state.setdefault("progress_markers", {})
+        value = _latest_timestamp(
+            self._resumed_high_water_mark, markers.get("replication_key_value")
+        )
+        started_at = parse_timestamp(self._crawl_started_at)
+        value_time = parse_timestamp(value)
+        if (
+            started_at is not None
+            and value_time is not None
+            and value_time > started_at
+        ):
+            value = started_at.isoformat()
+        markers["replication_key"] = self.replication_key
+        markers["replication_key_value"] = value
+
+    def _find_anchor(self, records: List[dict], cursor: dict) -> Optional[int]:
+        """Return the position of the cursor's anchor record on a page."""
+        anchor_key = cursor.get("anchor_key")
+        if anchor_key is None:
+            return None
+        key = self.primary_keys[0]
+        for position, record in enumerate(records):
+            if record.get(key) == anchor_key:
+                return position
+        return None
+
+    def _start_crawl(
+        self, context: Optional[dict], fetch: Callable[[Any], Tuple[Any, Any]]
+    ) -> Tuple[Any, Any, Optional[Any]]:
+        """Fetch the first page of a crawl, resuming from a checkpoint if valid.
+
+        A resumed crawl re-reads the boundary page, the one before the
+        checkpoint, where the anchor (the last record synced) was listed, so
+        records that moved up across the boundary are not lost. The records
+        synced before the interruption are skipped by _parse_page. When the
+        listing shrank below the checkpoint, the crawl steps back looking for
+        the anchor. Returns the request, the response and the token of the
+        resumed page, or None when the crawl starts from the first page.
+        """
+        self._resume_anchor = None
+        self._resumed_high_water_mark = None
+        self._last_page_record = None
+        cursor = self.get_pagination_cursor(context) if self.checkpoint_pages else None
+        if cursor is not None:
+            token = cursor[self.cursor_token_name]
+            token = self.get_previous_page_token(token) or token
+            for stepback in range(self._MAX_RESUME_STEPBACK + 1):
+                prepared_request, response = fetch(token)
+                records = list(
+                    extract_jsonpath(
+                        self.records_jsonpath, input=self.response_json(response)
+                    )
+                )
+                position = self._find_anchor(records, cursor)
+                if position is not None or (records and not stepback):
+                    self._resume_anchor = cursor
+                    self._resumed_high_water_mark = cursor.get("high_water_mark")
+                    self._crawl_started_at = cursor.get("crawl_started_at")
+                    self.logger.info(
+                        f"Resuming {self.name} crawl at {self.cursor_token_name} "
+                        f"{token}, after the last record synced"
+                    )
+                    return prepared_request, response, token
+
+                token = self.get_previous_page_token(token)
+                if token is None:
+                    break
+            self.logger.warning(
+                f"Could not find where the interrupted {self.name} crawl stopped, "
+                "restarting from the first page"
+            )
+
+        self._crawl_started_at = datetime.now(timezone.utc).isoformat()
+        prepared_request, response = fetch(None)
+        return prepared_request, response, None
+
+    def _parse_page(self, response: Any) -> Iterator[dict]:
+        """Parse one page, remembering its last record as checkpoint anchor."""
+        records: Iterable[dict] = self.parse_response(response)
+        if self._resume_anchor is not None:
+            records = self._skip_synced(list(records), self._resume_anchor)
+        for record in records:
+            self._last_page_record = record
+            yield record
+
+    def _skip_synced(self, records: List[dict], cursor: dict) -> List[dict]:
+        """Drop the records of a page synced before the crawl was interrupted.
+
+        Those are the records up to the anchor, or when the anchor moved off
+        the page, the records listed before it as newer than the anchor.
+        """
+        position = self._find_anchor(records, cursor)
+        if position is not None:
+            self._resume_anchor = None
+            return records[position + 1 :]
+
+        anchor_time = parse_timestamp(cursor.get("anchor_value"))
+        if anchor_time is None:
+            self._resume_anchor = None
+            return records
+        for position, record in enumerate(records):
+            record_time = parse_timestamp(record.get(self.replication_key))
+            if record_time is None or record_time <= anchor_time:
+                self._resume_anchor = None
+                return records[position:]
+        # Every record is still newer, so the anchor may be on the next page
+        return []
+
+    def _sync_children(self, child_context: Optional[dict]) -> None:
+        """Queue child contexts so that their first requests can be batched."""
+        if child_context is None or not any(
+            child.selected or child.has_selected_descendents
+            for child in self.child_streams
+        ):
+            super()._sync_children(child_context)
+            return
+
+        self._pending_child_contexts.append(child_context)
+        if len(self._pending_child_contexts) >= self.config.get(
+            "child_batch_size", 100
+        ):
+            self._flush_child_contexts()
+
+    def _flush_child_contexts(self) -> None:
+        """Prefetch the queued child contexts concurrently, then sync them."""
+        contexts, self._pending_child_contexts = self._pending_child_contexts, []
+        if not contexts:
+            return
+
+        for child in self.child_streams:
+            if isinstance(child, WordPressOrgAPIStream) and (
+                child.selected or child.has_selected_descendents
+            ):
+                child.prefetch(contexts)
+        for context in contexts:
+            super()._sync_children(context)
+
+    @property
+    def lookup_slugs(self) -> List[str]:
+        """Return the slugs to look up individually, if a watchlist is set."""
+        if not self.slug_list_setting:
+            return []
+        return list(dict.fromkeys(self.config.get(self.slug_list_setting) or []))
+
+    def _request_lookups(
+        self, context: Optional[dict], slugs: List[str]
+    ) -> Iterator[dict]:
+        """Look up each slug concurrently, yielding records in slug order."""
+        decorated_request = self.request_decorator(self._request)
+
+        def fetch(slug: str) -> Tuple[Any, Any]:
+            prepared_request = self.build_prepared_request(
+                method=self.http_method,
+                url=self.get_url(context),
+                params=self.get_lookup_params(slug),
+                headers=self.http_headers,
+                auth=self.authenticator,
+            )
+            return prepared_request, decorated_request(prepared_request, context)
+
+        self.logger.info(
+            f"Looking up {len(slugs)} {self.name} slugs with up to "
+            f"{self.max_concurrency} concurrent requests"
+        )
+        with metrics.http_request_counter(self.name, self.path) as request_counter:
+            request_counter.context = context
+            responses = self._fetch_in_order(fetch, slugs)
+            for slug, (prepared_request, response) in zip(slugs, responses):
+                request_counter.increment()
+                self.update_sync_costs(prepared_request, response, context)
+                record = self.response_json(response)
+                if not isinstance(record, dict) or not record.get("slug"):
+                    error = record.get("error") if isinstance(record, dict) else None
+                    self.logger.warning(f"Skipping {self.name} slug '{slug}': {error}")
+                    continue
+                yield record
+
+    def prefetch(self, contexts: List[dict]) -> None:
+        """Request the first page of several contexts concurrently.
+
+        request_records then starts each context from its prefetched response.
+        """
+        decorated_request = self.request_decorator(self._request)
+
+        def fetch(context: dict) -> Tuple[Any, Any]:
+            prepared_request = self.prepare_request(context, None)
+            return prepared_request, decorated_request(prepared_request, context)
+
+        self.logger.info(
+            f"Prefetching {len(contexts)} {self.name} contexts with up to "
+            f"{self.max_concurrency} concurrent requests"
+        )
+        with ThreadPoolExecutor(max_workers=self.max_concurrency) as executor:
+            for context, result in zip(contexts, executor.map(fetch, contexts)):
+                self._prefetched[self._context_key(context)] = result
+
+    @staticmethod
+    def _context_key(context: Optional[dict]) -> str:
+        return json.dumps(context or {}, sort_keys=True, default=str)
+
+    def request_records(self, context: Optional[dict]) -> Iterator[dict]:
+        """Request records, fetching pages concurrently when enabled."""
+        if self.lookup_slugs:
+            yield from self._request_lookups(context, self.lookup_slugs)
+            return
+
+        prefetched = self._prefetched.pop(self._context_key(context), None)
+        concurrent = self.parallel_pagination and self.max_concurrency > 1
+        checkpoint = self.checkpoint_pages > 0
+        if prefetched is None and not concurrent and not checkpoint:
+            yield from super().request_records(context)
+            return
+
+        decorated_request = self.request_decorator(self._request)
+
+        def fetch(next_page_token: Optional[Any]):
+            prepared_request = self.prepare_request(context, next_page_token)
+            return prepared_request, decorated_request(prepared_request, context)
+
+        with metrics.http_request_counter(self.name, self.path) as request_counter:
+            request_counter.context = context
+
+            resumed_token = None
+            if prefetched is not None:
+                prepared_request, response = prefetched
+            else:
+                prepared_request, response, resumed_token = self._start_crawl(
+                    context, fetch
+                )
+            parse = self._parse_page if checkpoint else self.parse_response
+            request_counter.increment()
+            self.update_sync_costs(prepared_request, response, context)
+            yield from parse(response)
+
+            page_tokens = self.get_page_tokens(response) if concurrent else None
+            if page_tokens is None:
+                # The page range is unknown, so follow the pages one by one
+                paginator = (
+                    self.get_new_paginator()
+                    if resumed_token is None
+                    else ResumedPaginator(self, resumed_token)
+                )
+                paginator.advance(response)
+                pages = 1
+                while not paginator.finished and not self._stop_pagination:
+                    self._checkpoint(context, pages, paginator.current_value)
+                    prepared_request, response = fetch(paginator.current_value)
+                    request_counter.increment()
+                    self.update_sync_costs(prepared_request, response, context)
+                    yield from parse(response)
+                    paginator.advance(response)
+                    pages += 1
+                return
+
+            if resumed_token is not None:
+                page_tokens = [token for token in page_tokens if token > resumed_token]
+            if self._stop_pagination or not page_tokens:
+                return
+
+            self.logger.info(
+                f"Fetching {len(page_tokens)} remaining pages with up to "
+                f"{self.max_concurrency} concurrent requests"
+            )
+            responses = self._fetch_in_order(fetch, page_tokens)
+            for pages, (prepared_request, response) in enumerate(responses, start=1):
+                self._checkpoint(context, pages, page_tokens[pages - 1])
+                request_counter.increment()
+                self.update_sync_costs(prepared_request, response, context)
+                yield from parse(response)
+
+    def _fetch_in_order(
+        self, fetch: Callable[[Any], Tuple[Any, Any]], tokens: Iterable[Any]
+    ) -> Iterator[Tuple[Any, Any]]:
+        """Fetch tokens on a worker pool, yielding responses in token order.
+
+        Only ``max_concurrency`` requests are in flight at a time, and no new
+        requests are sent once pagination is stopped.
+        """
+        remaining = iter(tokens)
+        with ThreadPoolExecutor(max_workers=self.max_concurrency) as executor:
+            pending: Deque[Future] = deque(
+                executor.submit(fetch, token)
+                for token in islice(remaining, self.max_concurrency)
+            )
+            try:
+                while pending:
+                    yield pending.popleft().result()
+                    if self._stop_pagination:
+                        break
+
+                    next_token = next(remaining, None)
+                    if next_token is not None:
+                        pending.append(executor.submit(fetch, next_token))
+            finally:
+                for future in pending:
+                    future.cancel()
+
+    def response_json(self, response: Any) -> Any:
+        """Return the decoded response body, decoding it only once."""
+        with self._decoded_responses_lock:
+            if response in self._decoded_responses:
+                return self._decoded_responses[response]
+
+        start = time.perf_counter()
+        payload = self.json_backend.loads(response.content)
+        self.instrumentation.add("decode_seconds", time.perf_counter() - start)
+        with self._decoded_responses_lock:
+            self._decoded_responses[response] = payload
+        return payload
+
     def parse_response(self, response: Any) -> Iterator[dict]:
         """Parse the response and return an iterator of result records."""
-        yield from extract_jsonpath(self.records_jsonpath, input=response.json())
+        if self.streaming_parse and _has_unread_body(response):
+            # Pages are not buffered, so bookmarks are only checked per row
+            yield from self._parse_streamed_response(response)
+            return
+
+        records = extract_jsonpath(
+            self.records_jsonpath, input=self.response_json(response)
+        )
+        if not (self.newest_first and self.replication_key):
+            yield from records
+            return
+
+        page = list(records)
+        if not page:
+            return
+
+        # Zero or unparseable dates are nulled in post_process and never
+        # compared, so the page is bounded by its first and last dated records
+        first = next((row for row in page if self._has_timestamp(row)), None)
+        last = next((row for row in reversed(page) if self._has_timestamp(row)), None)
+        bookmark = self._get_bookmark(self._partition_context)
+        if first is not None and self._is_older_than_bookmark(first, bookmark):
+            # Every dated record on this page was already synced
+            undated = [row for row in page if not self._has_timestamp(row)]
+            self._stop_pagination = True
+            self.instrumentation.add("records_dropped", len(page) - len(undated))
+            self.logger.info("Reached a page older than bookmark, stopping pagination")
+            yield from undated
+            return
+
+        # Skip per-row bookmark checks when even the last record is newer
+        self._page_is_newer = (
+            last is not None and self._is_older_than_bookmark(last, bookmark) is False
+        )
+        try:
+            yield from page
+        finally:
+            self._page_is_newer = False
+
+    def _parse_streamed_response(self, response: Any) -> Iterator[dict]:
+        """Yield records one at a time from a streamed response body.
 
-    def request(self, prepared_request, context: Optional[dict] = None):
-        """Make an API request with optional delay."""
-        # Add request delay if configured
-        request_delay = self.config.get("request_delay", 0.1)
-        if request_delay > 0:
-            time.sleep(request_delay)
+        The remaining top-level values are cached as the decoded payload, so
+        pagination can still read the ``info`` block.
+        """
+        array_key = self._ARRAY_JSONPATH.match(self.records_jsonpath).group(1)
+        metadata: Dict[str, Any] = {}
+        read_seconds = parse_seconds = 0.0
 
-        # Make the actual request
-        return super().request(prepared_request, context)
+        def on_read(size: int, seconds: float) -> None:
+            nonlocal read_seconds
+            read_seconds += seconds
+            self._count_bytes_received(size)
+
+        records = iter_streamed_array(response, array_key, metadata, on_read=on_read)
+        try:
+            while True:
+                start = time.perf_counter()
+                record = next(records, _END_OF_BODY)
+                parse_seconds += time.perf_counter() - start
+                if record is _END_OF_BODY:
+                    break
+                yield record
+        finally:
+            # Waiting for the body to arrive is network time, not decoding
+            self.instrumentation.add("decode_seconds", parse_seconds - read_seconds)
+        with self._decoded_responses_lock:
+            self._decoded_responses[response] = metadata
+
+    def get_context_state(self, context: Optional[dict]) -> dict:
+        """Return a writable state dict for the given context."""
+        with self._state_lock:
+            return super().get_context_state(context)
+
+    def _increment_stream_state(self, latest_record, *, context=None) -> None:
+        if self.lookup_slugs:
+            # Watched slugs are not the whole listing, so a full crawl bookmarked
+            # at their newest record would miss everything updated in between
+            return
+        replication_time = parse_timestamp(latest_record.get(self.replication_key))
+        if replication_time is not None:
+            # Bookmark ISO timestamps, which compare in time order as strings
+            latest_record = {
+                **latest_record,
+                self.replication_key: replication_time.isoformat(),
+            }
+        with self._state_lock:
+            super()._increment_stream_state(latest_record, context=context)
+
+    def _write_starting_replication_value(self, context: Optional[dict]) -> None:
+        with self._state_lock:
+            super()._write_starting_replication_value(context)
+
+    def _finalize_state(self, state: Optional[dict] = None) -> None:
+        with self._state_lock:
+            super()._finalize_state(state)
+
+    def reset_state_progress_markers(self, state: Optional[dict] = None) -> None:
+        """Reset progress markers, under the shared state lock."""
+        with self._state_lock:
+            super().reset_state_progress_markers(state)
+
+    def _write_state_message(self) -> None:
+        with self._state_lock:
+            super()._write_state_message()
+
+    def finalize_state_progress_markers(self, state: Optional[dict] = None) -> None:
+        """Reset progress markers and emit state message if necessary."""
+        with self._state_lock:
+            super().finalize_state_progress_markers(state)
+
+    def log_sync_costs(self) -> None:
+        """Log the sync costs, then report that this stream's sync ended."""
+        super().log_sync_costs()
+        if self.on_sync_end is not None:
+            self.on_sync_end(self)
+
+    @property
+    def requests_session(self) -> requests.Session:
+        """Return the HTTP session, shared across streams when set by the tap."""
+        if self._requests_session is None:
+            self._requests_session = create_session(self.config)
+        return self._requests_session
+
+    @requests_session.setter
+    def requests_session(self, session: requests.Session) -> None:
+        self._requests_session = session
+
+    @property
+    def rate_limiter(self) -> TokenBucketRateLimiter:
+        """Return the rate limiter, shared across streams when set by the tap."""
+        if self._rate_limiter is None:
+            self._rate_limiter = TokenBucketRateLimiter.from_config(self.config)
+        return self._rate_limiter
+
+    @rate_limiter.setter
+    def rate_limiter(self, rate_limiter: TokenBucketRateLimiter) -> None:
+        self._rate_limiter = rate_limiter
+
+    @property
+    def http_cache(self) -> Optional[HTTPResponseCache]:
+        """Return the HTTP response cache, if caching is enabled."""
+        if not self._http_cache_resolved:
+            self._http_cache = HTTPResponseCache.from_config(self.config)
+            self._http_cache_resolved = True
+        return self._http_cache
+
+    @http_cache.setter
+    def http_cache(self, http_cache: Optional[HTTPResponseCache]) -> None:
+        self._http_cache = http_cache
+        self._http_cache_resolved = True
+
+    @property
+    def fingerprint_index(self) -> Optional[FingerprintIndex]:
+        """Return the record fingerprint index, if change detection is enabled."""
+        if not self._fingerprint_index_resolved:
+            self._fingerprint_index = FingerprintIndex.from_config(self.config)
+            self._fingerprint_index_resolved = True
+        return self._fingerprint_index
+
+    @fingerprint_index.setter
+    def fingerprint_index(self, index: Optional[FingerprintIndex]) -> None:
+        self._fingerprint_index = index
+        self._fingerprint_index_resolved = True
+
+    def _filter_unchanged(self, row: dict) -> Optional[dict]:
+        """Drop records whose content is unchanged since they were last emitted."""
+        index = self.fingerprint_index
+        key = row.get(self.primary_keys[0]) if self.primary_keys else None
+        if index is None or key is None:
+            return row
+
+        if self._fingerprints is None:
+            self._fingerprints = index.load(self.name)
+
+        digest = fingerprint(row)
+        if self._fingerprints.get(key) == digest and not self.config.get(
+            "force_full_emission", False
+        ):
+            self._unchanged_records += 1
+            return None
+
+        self._fingerprints[key] = digest
+        self._changed_fingerprints[key] = digest
+        return row
+
+    def _save_fingerprints(self) -> None:
+        """Persist the fingerprints of the records emitted so far."""
+        if self.fingerprint_index is None:
+            return
+
+        if self._unchanged_records:
+            self.logger.info(
+                f"Skipped {self._unchanged_records} unchanged {self.name} records"
+            )
+        self.fingerprint_index.save(self.name, self._changed_fingerprints)
+        self._changed_fingerprints = {}
+        self._unchanged_records = 0
+
+    def get_http_cache_ttl(self) -> float:
+        """Return the cache TTL in seconds, overridable per stream in config."""
+        ttls = self.config.get("http_cache_ttls") or {}
+        return ttls.get(self.name, self.http_cache_ttl)
+
+    def _request(self, prepared_request, context: Optional[dict]):
+        """Make an API request, serving or revalidating cached responses."""
+        cache = self.http_cache
+        cache_key = cached = None
+        if cache is not None and prepared_request.method == "GET":
+            cache_key = cache.key_for(prepared_request)
+            cached = cache.get(cache_key)
+            if cached is not None:
+                if cached.age < self.get_http_cache_ttl():
+                    self.logger.debug(f"Serving {prepared_request.url} from cache")
+                    return cached.to_response(prepared_request)
+                prepared_request.headers.update(cached.conditional_headers())
+
+        waited = self.rate_limiter.acquire()
+        if waited:
+            self.instrumentation.add("rate_limit_wait", waited)
+        response = self._send(
+            prepared_request, context, stream=cache_key is None and self.streaming_parse
+        )
+
+        if cache_key is not None:
+            if response.status_code == 304 and cached is not None:
+                cache.revalidated(cache_key)
+                return cached.to_response(prepared_request)
+            if response.status_code == 200:
+                cache.store(cache_key, response)
+        return response
+
+    def _send(self, prepared_request, context: Optional[dict], stream: bool = False):
+        """Send a request, optionally leaving the body unread for streaming."""
+        start = time.perf_counter()
+        response = self.requests_session.send(
+            prepared_request,
+            timeout=self.timeout,
+            allow_redirects=self.allow_redirects,
+            stream=stream,
+        )
+        self.instrumentation.request_latency.observe(time.perf_counter() - start)
+        if not stream:
+            # Streamed bodies are counted as they are read
+            self._count_bytes_received(len(response.content))
+        self._write_request_duration_log(
+            endpoint=self.path,
+            response=response,
+            context=context,
+            extra_tags=(
+                {"url": prepared_request.path_url}
+                if self._LOG_REQUEST_METRIC_URLS
+                else None
+            ),
+        )
+        self.validate_response(response)
+        return response
+
+    def _count_bytes_received(self, size: int) -> None:
+        self.instrumentation.add("bytes_received", size)
+
+    def validate_response(self, response) -> None:
+        """Feed throttling signals to the rate limiter, then validate."""
+        self.rate_limiter.record_response(
+            response.status_code,
+            parse_retry_after(response.headers.get("Retry-After")),
+        )
+        if response.status_code == 404 and self.lookup_slugs:
+            # Unknown slugs are skipped when parsing the lookup
+            return
+        super().validate_response(response)
+
+    def _get_bookmark(self, context: Optional[dict]) -> Tuple[Any, Optional[datetime]]:
+        """Return the partition's starting bookmark, raw and parsed.
+
+        The bookmark is resolved from state once per partition rather than on
+        every row.
+        """
+        context = dict(context) if context else None
+        if not self._bookmark_resolved or context != self._bookmark_context:
+            try:
+                starting_value = self.get_starting_replication_key_value(context)
+            except (KeyError, TypeError, ValueError) as e:
+                # A malformed state should not abort the sync
+                self.logger.error(f"Could not read the {self.name} bookmark: {e}")
+                starting_value = None
+            self._bookmark = (starting_value, parse_timestamp(starting_value))
+            self._bookmark_context = context
+            self._bookmark_resolved = True
+        return self._bookmark
+
+    def _has_timestamp(self, row: dict) -> bool:
+        """Return whether a row's replication key holds a parseable timestamp."""
+        return parse_timestamp(row.get(self.replication_key)) is not None
+
+    def _is_older_than_bookmark(
+        self, row: dict, bookmark: Tuple[Any, Optional[datetime]]
+    ) -> Optional[bool]:
+        """Return whether a row is not newer than the bookmark.
+
+        With bookmark_inclusive, only rows before the bookmark are older.
+        Returns None when there is no bookmark or the row has no value.
+        """
+        starting_value, starting_time = bookmark
+        replication_value = row.get(self.replication_key)
+        if not starting_value or not replication_value:
+            return None
+
+        replication_time = parse_timestamp(replication_value)
+        if starting_time is not None and replication_time is not None:
+            if self.bookmark_inclusive:
+                return replication_time < starting_time
+            return replication_time <= starting_time
+        if self.bookmark_inclusive:
+            return replication_value < starting_value
+        return replication_value <= starting_value
 
     def _filter_by_replication_key(
         self, row: dict, context: Optional[dict] = None
     ) -> Optional[dict]:
         """Filter out records older than bookmark, set stop flag if found."""
-        if not self.replication_key:
+        if not self.replication_key or self.lookup_slugs:
             return row
 
-        starting_value = self.get_starting_replication_key_value(context)
-        if not starting_value:
+        if self._page_is_newer:
             return row
 
-        replication_value = row.get(self.replication_key)
-        if replication_value and replication_value <= starting_value:
+        if self._is_older_than_bookmark(row, self._get_bookmark(context)):
             if not self._stop_pagination:
-                self.logger.info(
+                # Child streams reach their bookmark once per partition
+                self.logger.debug(
                     "Reached records older than bookmark, stopping pagination"
                 )
             self._stop_pagination = True
+            self.instrumentation.add("records_dropped", 1)
             return None
 
         return row
+
+
+class WordPressOrgStatsStream(WordPressOrgAPIStream):
+    """Base class for the usage statistics streams."""
+
+    replication_key = None
+    records_jsonpath = "$[*]"
+
+    # Usage statistics change at most daily
+    http_cache_ttl = 12 * 60 * 60
+
+    #: Name of the record field holding the stats map key
+    stats_key = "version"
+
+    def parse_response(self, response: Any) -> Iterator[dict]:
+        """Parse the stats response into count and percent records."""
+        yield from iter_stats_records(self.response_json(response), self.stats_key)
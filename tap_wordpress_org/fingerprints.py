@@ -0,0 +1,74 @@
+"""Persistent record fingerprints used to skip unchanged records."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import sqlite3
+import threading
+from typing import Any, Dict, Optional
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+
+def fingerprint(record: Dict[str, Any]) -> str:
+    """Return a stable content hash of a record."""
+    if orjson is not None:
+        data = orjson.dumps(
+            record,
+            default=str,
+            option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS,
+        )
+    else:
+        data = json.dumps(
+            record, default=str, sort_keys=True, separators=(",", ":")
+        ).encode()
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+class FingerprintIndex:
+    """SQLite-backed map of stream and record key to content hash."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.execute(
+            """
+            CREATE TABLE IF NOT EXISTS fingerprints (
+                stream TEXT NOT NULL,
+                key TEXT NOT NULL,
+                hash TEXT NOT NULL,
+                PRIMARY KEY (stream, key)
+            )
+            """
+        )
+        self._connection.commit()
+
+    @classmethod
+    def from_config(cls, config: dict) -> Optional["FingerprintIndex"]:
+        """Build an index from tap settings, or None when it is disabled."""
+        path = config.get("fingerprint_index_path")
+        return cls(path) if path else None
+
+    def load(self, stream: str) -> Dict[str, str]:
+        """Return every stored fingerprint of a stream."""
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT key, hash FROM fingerprints WHERE stream = ?", (stream,)
+            ).fetchall()
+        return dict(rows)
+
+    def save(self, stream: str, fingerprints: Dict[str, str]) -> None:
+        """Store new or changed fingerprints of a stream."""
+        if not fingerprints:
+            return
+        with self._lock:
+            self._connection.executemany(
+                "INSERT OR REPLACE INTO fingerprints VALUES (?, ?, ?)",
+                [(stream, key, value) for key, value in fingerprints.items()],
+            )
+            self._connection.commit()
@@ -0,0 +1,187 @@
+"""Per-stream timings and counters, logged as Singer metrics."""
+
+from __future__ import annotations
+
+import enum
+import functools
+import os
+import threading
+import time
+from bisect import bisect_left
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from singer_sdk import metrics
+
+#: Upper bounds in seconds of the request latency histogram buckets
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+#: Prefix of the Prometheus metric names
+PROMETHEUS_PREFIX = "tap_wordpress_org"
+
+
+class StreamMetric(str, enum.Enum):
+    """Metrics collected by the streams, alongside the SDK's own metrics."""
+
+    HTTP_REQUEST_LATENCY = "http_request_latency"
+    HTTP_BYTES_RECEIVED = "http_bytes_received"
+    DECODE_DURATION = "decode_duration"
+    TRANSFORM_DURATION = "transform_duration"
+    RECORDS_DROPPED = "records_dropped"
+    RATE_LIMIT_WAIT = "rate_limit_wait"
+
+
+class Histogram:
+    """Thread-safe histogram of durations over fixed buckets."""
+
+    def __init__(self, buckets: Tuple[float, ...] = LATENCY_BUCKETS):
+        self.buckets = buckets
+        # One count per bucket, plus one for values above the last bound
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        """Add one observation."""
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            self.counts[index] += 1
+            self.sum += value
+            self.count += 1
+
+    def cumulative_counts(self) -> List[Tuple[str, int]]:
+        """Return the count of observations up to each bound, ending with +Inf."""
+        bounds = [str(bound) for bound in self.buckets] + ["+Inf"]
+        cumulative, total = [], 0
+        for bound, count in zip(bounds, self.counts):
+            total += count
+            cumulative.append((bound, total))
+        return cumulative
+
+    def to_dict(self) -> dict:
+        """Return the histogram as a metric value."""
+        return {
+            "buckets": dict(self.cumulative_counts()),
+            "sum": self.sum,
+            "count": self.count,
+        }
+
+
+class StreamStats:
+    """Timings and counters of one stream's hot path."""
+
+    def __init__(self):
+        self.request_latency = Histogram()
+        self.bytes_received = 0
+        self.decode_seconds = 0.0
+        self.transform_seconds = 0.0
+        self.records_dropped = 0
+        self.rate_limit_wait = 0.0
+        self._lock = threading.Lock()
+
+    def add(self, name: str, value: float) -> None:
+        """Add to one of the counters, from any thread."""
+        with self._lock:
+            setattr(self, name, getattr(self, name) + value)
+
+    @property
+    def active(self) -> bool:
+        """Return whether the stream sent any request."""
+        return self.request_latency.count > 0
+
+    def points(self, tags: dict) -> Iterable[metrics.Point]:
+        """Yield the collected values as Singer metric points."""
+        yield metrics.Point(
+            "histogram",
+            StreamMetric.HTTP_REQUEST_LATENCY,  # type: ignore[arg-type]
+            self.request_latency.to_dict(),
+            tags,
+        )
+        counters = [
+            (StreamMetric.HTTP_BYTES_RECEIVED, "counter", self.bytes_received),
+            (StreamMetric.DECODE_DURATION, "timer", self.decode_seconds),
+            (StreamMetric.TRANSFORM_DURATION, "timer", self.transform_seconds),
+            (StreamMetric.RECORDS_DROPPED, "counter", self.records_dropped),
+            (StreamMetric.RATE_LIMIT_WAIT, "timer", self.rate_limit_wait),
+        ]
+        for metric, metric_type, value in counters:
+            yield metrics.Point(
+                metric_type, metric, value, tags  # type: ignore[arg-type]
+            )
+
+
+def log_stream_stats(stats: Dict[str, StreamStats]) -> None:
+    """Log the stats of every stream that sent requests as metric lines."""
+    logger = metrics.get_metrics_logger()
+    for stream_name, stream_stats in stats.items():
+        if stream_stats.active:
+            for point in stream_stats.points({metrics.Tag.STREAM: stream_name}):
+                metrics.log(logger, point)
+
+
+def timed_post_process(func: Callable) -> Callable:
+    """Add the time spent in a stream's post_process to its transform time."""
+
+    @functools.wraps(func)
+    def wrapper(self, row: dict, context: Optional[dict] = None) -> Optional[dict]:
+        start = time.perf_counter()
+        try:
+            return func(self, row, context)
+        finally:
+            # Records are post-processed on the stream's sync thread only
+            self.instrumentation.transform_seconds += time.perf_counter() - start
+
+    return wrapper
+
+
+def _labels(**labels: str) -> str:
+    return ",".join(f'{name}="{value}"' for name, value in labels.items())
+
+
+def format_prometheus(stats: Dict[str, StreamStats]) -> str:
+    """Return the stats in the Prometheus text exposition format."""
+    active = {name: value for name, value in stats.items() if value.active}
+    latency = f"{PROMETHEUS_PREFIX}_http_request_duration_seconds"
+    lines = [
+        f"# HELP {latency} API request latency.",
+        f"# TYPE {latency} histogram",
+    ]
+    for name, stream_stats in active.items():
+        histogram = stream_stats.request_latency
+        for bound, count in histogram.cumulative_counts():
+            lines.append(
+                f"{latency}_bucket{{{_labels(stream=name, le=bound)}}} {count}"
+            )
+        lines.append(f"{latency}_sum{{{_labels(stream=name)}}} {histogram.sum}")
+        lines.append(f"{latency}_count{{{_labels(stream=name)}}} {histogram.count}")
+
+    counters = [
+        ("http_response_bytes_total", "Bytes of API responses.", "bytes_received"),
+        ("decode_seconds_total", "Time spent decoding JSON.", "decode_seconds"),
+        ("transform_seconds_total", "Time spent in post_process.", "transform_seconds"),
+        (
+            "records_dropped_total",
+            "Records older than the bookmark.",
+            "records_dropped",
+        ),
+        (
+            "rate_limit_wait_seconds_total",
+            "Time waiting for the rate limiter.",
+            "rate_limit_wait",
+        ),
+    ]
+    for suffix, help_text, attribute in counters:
+        metric = f"{PROMETHEUS_PREFIX}_{suffix}"
+        lines += [f"# HELP {metric} {help_text}", f"# TYPE {metric} counter"]
+        for name, stream_stats in active.items():
+            value = getattr(stream_stats, attribute)
+            lines.append(f"{metric}{{{_labels(stream=name)}}} {value}")
+    return "\n".join(lines) + "\n"
+
+
+def write_prometheus(path: str, stats: Dict[str, StreamStats]) -> None:
+    """Write the stats to a Prometheus textfile, replacing it atomically."""
+    temp_path = f"{path}.tmp"
+    with open(temp_path, "w") as textfile:
+        textfile.write(format_prometheus(stats))
+    os.replace(temp_path, path)
@@ -0,0 +1,143 @@
+"""Profile a sync, attributing time to each stream and hot method."""
+
+from __future__ import annotations
+
+import cProfile
+import pstats
+import sys
+import threading
+import time
+from collections import defaultdict
+from typing import IO, Any, Callable, Dict, Iterable, Iterator, List, Optional
+
+#: Stream methods timed per stream, by report label
+PROFILED_METHODS = {
+    "request": "_request",
+    "parse_response": "parse_response",
+    "post_process": "post_process",
+    "get_next_page_token": "get_next_page_token",
+}
+
+# Every wrapped method, including the stream's whole sync
+_WRAPPED_METHODS = {"sync": "sync", **PROFILED_METHODS}
+
+# Methods returning generators, timed while they are iterated
+_GENERATOR_METHODS = {"parse_response"}
+
+
+def _timed_iter(iterator: Iterator, add: Callable[[float], None]) -> Iterator:
+    """Yield from an iterator, adding the time spent producing each item."""
+    try:
+        while True:
+            start = time.perf_counter()
+            try:
+                item = next(iterator)
+            except StopIteration:
+                add(time.perf_counter() - start)
+                return
+            add(time.perf_counter() - start)
+            yield item
+    finally:
+        close = getattr(iterator, "close", None)
+        if close is not None:
+            close()
+
+
+class SyncProfiler:
+    """Run a sync under cProfile while timing each stream's hot methods.
+
+    cProfile only sees the thread that starts it, so the per-method timings,
+    which are summed over every thread, also cover concurrent page fetches
+    and streams synced on worker threads.
+    """
+
+    def __init__(
+        self,
+        streams: Iterable[Any],
+        output: str,
+        top: int = 25,
+        report: Optional[IO[str]] = None,
+    ):
+        self.streams = list(streams)
+        self.output = output
+        self.top = top
+        self.report = report or sys.stderr
+        self.seconds: Dict[str, Dict[str, float]] = defaultdict(
+            lambda: defaultdict(float)
+        )
+        self.calls: Dict[str, Dict[str, int]] = defaultdict(lambda: defaultdict(int))
+        self._profiler = cProfile.Profile()
+        self._lock = threading.Lock()
+
+    def _add(self, stream_name: str, label: str, elapsed: float, calls: int) -> None:
+        with self._lock:
+            self.seconds[stream_name][label] += elapsed
+            self.calls[stream_name][label] += calls
+
+    def _wrap(self, stream_name: str, label: str, method: Callable) -> Callable:
+        if label in _GENERATOR_METHODS:
+
+            def timed_generator(*args, **kwargs):
+                self._add(stream_name, label, 0.0, 1)
+                return _timed_iter(
+                    method(*args, **kwargs),
+                    lambda elapsed: self._add(stream_name, label, elapsed, 0),
+                )
+
+            return timed_generator
+
+        def timed(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                self._add(stream_name, label, time.perf_counter() - start, 1)
+
+        return timed
+
+    def __enter__(self) -> SyncProfiler:
+        for stream in self.streams:
+            for label, name in _WRAPPED_METHODS.items():
+                # Streams paginating with the SDK's paginator have no page token hook
+                method = getattr(stream, name, None)
+                if method is not None:
+                    setattr(stream, name, self._wrap(stream.name, label, method))
+        self._profiler.enable()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self._profiler.disable()
+        for stream in self.streams:
+            for name in _WRAPPED_METHODS.values():
+                # Drop the instance wrappers, exposing the class methods again
+                stream.__dict__.pop(name, None)
+        self._profiler.dump_stats(self.output)
+        self.write_report()
+
+    def summary_rows(self) -> List[List[str]]:
+        """Return the per-stream table of seconds and calls of each method."""
+        labels = list(_WRAPPED_METHODS)
+        rows = [["stream", *labels]]
+        for stream_name, seconds in self.seconds.items():
+            calls = self.calls[stream_name]
+            rows.append(
+                [stream_name]
+                + [f"{seconds[label]:.3f}s/{calls[label]}" for label in labels]
+            )
+        return rows
+
+    def write_report(self) -> None:
+        """Write the per-stream timings and the top functions to the report."""
+        write = self.report.write
+        write(f"Profile written to {self.output}\n")
+        write("Time per stream and method (seconds/calls, summed over threads):\n")
+        rows = self.summary_rows()
+        widths = [max(len(row[i]) for row in rows) for i in range(len(rows[0]))]
+        for row in rows:
+            name, *cells = row
+            write(f"  {name.ljust(widths[0])}  ")
+            write("  ".join(cell.rjust(w) for cell, w in zip(cells, widths[1:])))
+            write("\n")
+        write(f"Top {self.top} functions by cumulative time:\n")
+        stats = pstats.Stats(self._profiler, stream=self.report)
+        stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(self.top)
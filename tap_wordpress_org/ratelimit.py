@@ -0,0 +1,120 @@
+"""Adaptive request rate limiting for the WordPress.org API."""
+
+from __future__ import annotations
+
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Optional
+
+THROTTLE_STATUS_CODES = (429, 503)
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Return the delay in seconds requested by a ``Retry-After`` header."""
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(retry_at.timestamp() - time.time(), 0.0)
+
+
+class TokenBucketRateLimiter:
+    """Token bucket shared by all streams and workers.
+
+    The rate is halved whenever the API throttles a request (429/503 or a
+    ``Retry-After`` header) and ramps back up towards the configured rate after
+    a run of successful responses.
+    """
+
+    def __init__(
+        self,
+        requests_per_second: float,
+        burst_size: int = 1,
+        min_requests_per_second: float = 0.1,
+        recovery_after: int = 20,
+    ):
+        self.max_rate = requests_per_second
+        self.rate = requests_per_second
+        self.burst_size = max(burst_size, 1)
+        self.min_rate = min(min_requests_per_second, requests_per_second)
+        self.recovery_after = recovery_after
+        self.total_wait = 0.0
+        self._tokens = float(self.burst_size)
+        self._updated_at = time.monotonic()
+        self._blocked_until = 0.0
+        self._successes = 0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, config: dict) -> "TokenBucketRateLimiter":
+        """Build a limiter from tap settings."""
+        requests_per_second = config.get("requests_per_second")
+        if requests_per_second is None:
+            # Derive the rate from the legacy fixed delay setting
+            request_delay = config.get("request_delay", 0.1)
+            requests_per_second = 1 / request_delay if request_delay > 0 else 0
+        return cls(
+            requests_per_second=requests_per_second,
+            burst_size=config.get("burst_size", 1),
+        )
+
+    @property
+    def enabled(self) -> bool:
+        """Return whether requests are limited at all."""
+        return self.max_rate > 0
+
+    def _refill(self, now: float) -> None:
+        elapsed = now - self._updated_at
+        self._updated_at = now
+        self._tokens = min(self._tokens + elapsed * self.rate, self.burst_size)
+
+    def acquire(self) -> float:
+        """Block until a request may be sent and return the time waited."""
+        if not self.enabled:
+            return 0.0
+
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                delay = self._blocked_until - now
+                if delay <= 0:
+                    if self._tokens >= 1:
+                        self._tokens -= 1
+                        self.total_wait += waited
+                        return waited
+                    delay = (1 - self._tokens) / self.rate
+            time.sleep(delay)
+            waited += delay
+
+    def record_response(
+        self, status_code: int, retry_after: Optional[float] = None
+    ) -> None:
+        """Adapt the rate to the outcome of a request."""
+        if not self.enabled:
+            return
+
+        with self._lock:
+            if status_code in THROTTLE_STATUS_CODES or retry_after:
+                self._successes = 0
+                self.rate = max(self.rate / 2, self.min_rate)
+                self._tokens = min(self._tokens, 0.0)
+                if retry_after:
+                    self._blocked_until = max(
+                        self._blocked_until, time.monotonic() + retry_after
+                    )
+                return
+
+            if status_code < 400 and self.rate < self.max_rate:
+                self._successes += 1
+                if self._successes >= self.recovery_after:
+                    self._successes = 0
+                    self.rate = min(self.rate * 1.5, self.max_rate)
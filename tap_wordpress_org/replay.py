@@ -0,0 +1,164 @@
+"""Record API responses to an archive and replay them without the network."""
+
+from __future__ import annotations
+
+import base64
+import gzip
+import json
+import os
+import random
+import threading
+import time
+from collections import defaultdict
+from typing import IO, Dict, List, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import requests
+from requests.adapters import BaseAdapter, HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+
+#: Archive modes of the http_archive_mode setting
+ARCHIVE_MODES = ("record", "replay")
+
+# Headers describing the wire encoding, which no longer apply to stored bodies
+_SKIPPED_HEADERS = {"content-encoding", "content-length", "transfer-encoding"}
+
+
+def request_key(method: str, url: str) -> str:
+    """Return the archive key of a request, independent of query order."""
+    parts = urlsplit(url)
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    return f"{method.upper()} {urlunsplit(parts._replace(query=query))}"
+
+
+def _encode_response(response: requests.Response) -> dict:
+    """Return an archive entry for a response."""
+    entry = {
+        "key": request_key(response.request.method or "GET", response.url),
+        "status": response.status_code,
+        "reason": response.reason,
+        "headers": {
+            name: value
+            for name, value in response.headers.items()
+            if name.lower() not in _SKIPPED_HEADERS
+        },
+    }
+    try:
+        entry["body"] = response.content.decode("utf-8")
+    except UnicodeDecodeError:
+        entry["body_b64"] = base64.b64encode(response.content).decode("ascii")
+    return entry
+
+
+def load_archive(path: str) -> Dict[str, List[dict]]:
+    """Return the archived responses of each request key, in recorded order."""
+    entries: Dict[str, List[dict]] = defaultdict(list)
+    with gzip.open(path, "rt", encoding="utf-8") as archive:
+        for line in archive:
+            if line.strip():
+                entry = json.loads(line)
+                entries[entry["key"]].append(entry)
+    return dict(entries)
+
+
+class RecordingAdapter(HTTPAdapter):
+    """Transport adapter appending every response to a gzipped JSONL archive.
+
+    Responses go to a temporary file, opened on the first request and moved
+    over the archive on close, so a session built without sending requests,
+    as during discovery, leaves an existing archive untouched.
+    """
+
+    def __init__(self, path: str, **kwargs):
+        super().__init__(**kwargs)
+        self.path = path
+        self._lock = threading.Lock()
+        self._temp_path = f"{path}.tmp"
+        self._archive: Optional[IO[str]] = None
+
+    def send(self, request, **kwargs) -> requests.Response:
+        """Send the request and record its response."""
+        response = super().send(request, **kwargs)
+        line = json.dumps(_encode_response(response), separators=(",", ":"))
+        with self._lock:
+            if self._archive is None:
+                self._archive = gzip.open(self._temp_path, "wt", encoding="utf-8")
+            self._archive.write(line + "\n")
+        return response
+
+    def close(self) -> None:
+        """Close the connection pools and finish the archive."""
+        super().close()
+        with self._lock:
+            if self._archive is not None and not self._archive.closed:
+                self._archive.close()
+                os.replace(self._temp_path, self.path)
+
+
+class ReplayAdapter(BaseAdapter):
+    """Transport adapter serving archived responses with simulated latency.
+
+    Each request sleeps for ``latency`` seconds, give or take up to ``jitter``
+    seconds, before its archived response is returned. Responses recorded
+    more than once for the same request are served in recorded order, the
+    last one repeating. Requests missing from the archive get a 404.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        seed: Optional[int] = None,
+    ):
+        super().__init__()
+        self.path = path
+        self.latency = latency
+        self.jitter = jitter
+        self._entries = load_archive(path)
+        self._served: Dict[str, int] = defaultdict(int)
+        self._lock = threading.Lock()
+        self._random = random.Random(seed)
+
+    def _next_entry(self, key: str) -> Optional[dict]:
+        with self._lock:
+            entries = self._entries.get(key)
+            if not entries:
+                return None
+            index = min(self._served[key], len(entries) - 1)
+            self._served[key] += 1
+            return entries[index]
+
+    def _delay(self) -> float:
+        with self._lock:
+            offset = self._random.uniform(-self.jitter, self.jitter)
+        return max(self.latency + offset, 0.0)
+
+    def send(self, request, **kwargs) -> requests.Response:
+        """Return the archived response of the request."""
+        delay = self._delay()
+        if delay:
+            time.sleep(delay)
+
+        entry = self._next_entry(request_key(request.method or "GET", request.url))
+        response = requests.Response()
+        response.request = request
+        response.url = request.url
+        if entry is None:
+            response.status_code = 404
+            response.reason = "Not Recorded"
+            response._content = b""
+            return response
+
+        response.status_code = entry["status"]
+        response.reason = entry.get("reason")
+        response.headers = CaseInsensitiveDict(entry.get("headers", {}))
+        if "body_b64" in entry:
+            response._content = base64.b64decode(entry["body_b64"])
+        else:
+            response._content = entry.get("body", "").encode("utf-8")
+        response.encoding = "utf-8"
+        return response
+
+    def close(self) -> None:
+        """Nothing to release, archives are read into memory."""
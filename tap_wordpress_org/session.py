@@ -0,0 +1,65 @@
+"""Pooled HTTP session shared by every stream of the tap."""
+
+from __future__ import annotations
+
+from typing import Dict
+
+import requests
+from requests.adapters import BaseAdapter, HTTPAdapter
+
+from tap_wordpress_org.replay import RecordingAdapter, ReplayAdapter
+
+
+def create_session(config: dict) -> requests.Session:
+    """Build a keep-alive session whose connection pools fit the tap settings.
+
+    With ``http_archive`` set, responses are recorded to the archive or
+    replayed from it, depending on ``http_archive_mode``.
+    """
+    pool_maxsize = config.get("http_pool_maxsize")
+    if pool_maxsize is None:
+        # Leave room for every concurrent page or location request
+        pool_maxsize = max(10, int(config.get("max_concurrency", 1)))
+
+    pool_settings = {
+        "pool_connections": config.get("http_pool_connections", 10),
+        "pool_maxsize": pool_maxsize,
+    }
+    archive = config.get("http_archive")
+    mode = config.get("http_archive_mode", "replay")
+    adapter: BaseAdapter
+    if archive and mode == "record":
+        adapter = RecordingAdapter(archive, **pool_settings)
+    elif archive:
+        adapter = ReplayAdapter(
+            archive,
+            latency=config.get("replay_latency", 0.0),
+            jitter=config.get("replay_jitter", 0.0),
+        )
+    else:
+        adapter = HTTPAdapter(**pool_settings)
+
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    if not config.get("http_keep_alive", True):
+        session.headers["Connection"] = "close"
+    return session
+
+
+def get_pool_stats(session: requests.Session) -> Dict[str, int]:
+    """Return request and connection counts of a session's connection pools."""
+    stats = {"requests": 0, "new_connections": 0, "reused_connections": 0}
+    adapters = {id(adapter): adapter for adapter in session.adapters.values()}
+    for adapter in adapters.values():
+        pool_manager = getattr(adapter, "poolmanager", None)
+        if pool_manager is None:
+            continue
+        for key in pool_manager.pools.keys():
+            pool = pool_manager.pools.get(key)
+            if pool is None:
+                continue
+            stats["requests"] += pool.num_requests
+            stats["new_connections"] += pool.num_connections
+    stats["reused_connections"] = max(stats["requests"] - stats["new_connections"], 0)
+    return stats
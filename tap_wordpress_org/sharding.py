@@ -0,0 +1,71 @@
+"""Merge the Singer state written by sharded tap workers."""
+
+from __future__ import annotations
+
+import json
+import sys
+from typing import Any, Dict, Iterable, List, Optional
+
+from tap_wordpress_org.client import parse_timestamp
+
+
+def _is_newer(value: Any, current: Any) -> bool:
+    """Return whether a replication key value is ahead of the current one."""
+    if current is None:
+        return True
+    if value is None:
+        return False
+
+    value_time, current_time = parse_timestamp(value), parse_timestamp(current)
+    if value_time is not None and current_time is not None:
+        return value_time > current_time
+    return str(value) > str(current)
+
+
+def _merge_partitions(partitions: Iterable[dict]) -> List[dict]:
+    """Keep the most advanced state entry of each partition context."""
+    merged: Dict[str, dict] = {}
+    for partition in partitions:
+        key = json.dumps(partition.get("context", {}), sort_keys=True)
+        current = merged.get(key)
+        if current is None or _is_newer(
+            partition.get("replication_key_value"),
+            current.get("replication_key_value"),
+        ):
+            merged[key] = partition
+    return list(merged.values())
+
+
+def merge_states(states: Iterable[dict]) -> dict:
+    """Merge the Singer state of several shard workers into one state.
+
+    Partition entries are combined by context, keeping the most advanced
+    bookmark when the same partition appears more than once.
+    """
+    bookmarks: Dict[str, dict] = {}
+    for state in states:
+        for stream_name, bookmark in state.get("bookmarks", {}).items():
+            merged = bookmarks.setdefault(stream_name, {})
+            for key, value in bookmark.items():
+                if key == "partitions":
+                    merged[key] = _merge_partitions(merged.get(key, []) + value)
+                elif key != "replication_key_value" or _is_newer(
+                    value, merged.get(key)
+                ):
+                    merged[key] = value
+    return {"bookmarks": bookmarks}
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Print the merged state of the given state files."""
+    paths = sys.argv[1:] if argv is None else argv
+    states = []
+    for path in paths:
+        with open(path) as state_file:
+            states.append(json.load(state_file))
+    json.dump(merge_states(states), sys.stdout, indent=2)
+    sys.stdout.write("\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,12 +2,18 @@
 
 from __future__ import annotations
 
-from datetime import datetime
-from typing import Any, Dict, Optional
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterator, List, Optional, Set
 
+import requests
 from singer_sdk import typing as th
 
-from tap_wordpress_org.client import WordPressOrgAPIStream
+from tap_wordpress_org.client import (
+    WordPressOrgAPIStream,
+    WordPressOrgStatsStream,
+    parse_timestamp,
+)
+from tap_wordpress_org.instrumentation import timed_post_process
 
 
 class PluginsStream(WordPressOrgAPIStream):
@@ -18,6 +24,62 @@ class PluginsStream(WordPressOrgAPIStream):
     primary_keys = ["slug"]
     replication_key = "last_updated"
     records_jsonpath = "$.plugins[*]"
+    parallel_pagination = True
+    newest_first = True
+    shardable = True
+    field_param_template = "fields[{}]"
+    slug_list_setting = "plugin_slugs"
+    resumable_pagination = True
+    browse = "updated"
+    required_record_fields = ("slug",)
+    decode_entities = True
+    false_to_null_fields = ("requires_php", "requires", "tested")
+    zero_date_fields = ("last_updated",)
+    change_detection = True
+    default_fields = frozenset(
+        {
+            "slug",
+            "name",
+            "short_description",
+            "author",
+            "author_profile",
+            "requires",
+            "tested",
+            "requires_php",
+            "rating",
+            "ratings",
+            "num_ratings",
+            "active_installs",
+            "downloaded",
+            "last_updated",
+            "added",
+            "homepage",
+            "tags",
+            "donate_link",
+            "download_link",
+        }
+    )
+    lookup_default_fields = frozenset(
+        {
+            "slug",
+            "name",
+            "author",
+            "author_profile",
+            "contributors",
+            "requires",
+            "tested",
+            "requires_php",
+            "rating",
+            "ratings",
+            "num_ratings",
+            "last_updated",
+            "homepage",
+            "sections",
+            "tags",
+            "donate_link",
+            "download_link",
+        }
+    )
 
     schema = th.PropertiesList(
         th.Property("slug", th.StringType, description="Plugin slug"),
@@ -78,14 +140,24 @@ class PluginsStream(WordPressOrgAPIStream):
         """Return URL parameters for plugin search."""
         params = {
             "action": "query_plugins",
-            "per_page": 100,
-            "browse": "updated",  # Use 'updated' for better incremental sync
+            "per_page": self.config.get("page_size", 100),
+            "browse": self.browse,  # Use 'updated' for better incremental sync
+            **self.get_field_params(),
         }
-        if next_page_token:
-            params["page"] = next_page_token
+        page = next_page_token or self.get_first_page(context)
+        if page > 1:
+            params["page"] = page
 
         return params
 
+    def get_lookup_params(self, slug: str) -> Dict[str, Any]:
+        """Return URL parameters for a single plugin's information."""
+        return {
+            "action": "plugin_information",
+            "slug": slug,
+            **self.get_field_params(lookup=True),
+        }
+
     def get_starting_timestamp(self, context: Optional[dict]) -> Optional[datetime]:
         """Get starting timestamp for incremental replication."""
         state = self.get_context_state(context)
@@ -100,58 +172,117 @@ class PluginsStream(WordPressOrgAPIStream):
 
         return None
 
-    def post_process(self, row: dict, context: Optional[dict] = None) -> Optional[dict]:
-        """Post-process record with custom transformations."""
-        try:
-            # Validate required fields
-            if not row.get("slug"):
-                self.logger.warning(
-                    f"Skipping plugin record missing required 'slug' field: {row}"
-                )
-                return None
-
-            # Custom transformation: HTML entity decoding
-            if row.get("name"):
-                row["name"] = row["name"].replace("&#8211;", "–").replace("&amp;", "&")
-
-            if row.get("short_description"):
-                row["short_description"] = (
-                    row["short_description"]
-                    .replace("&#8211;", "–")
-                    .replace("&amp;", "&")
-                )
-
-            # Custom transformation: Normalize boolean fields to null
-            for field in ["requires_php", "requires", "tested"]:
-                if row.get(field) is False:
-                    row[field] = None
-
-            # Handle invalid date values
-            if row.get("last_updated") == "0000-00-00 00:00:00":
-                row["last_updated"] = None
-
-            return self._filter_by_replication_key(row, context)
-
-        except Exception as e:
-            self.logger.error(
-                f"Error processing plugin record {row.get('slug', 'unknown')}: {e}"
-            )
-            # Return original record rather than failing completely
-            return row
+    def get_child_context(self, record: dict, context: Optional[dict]) -> dict:
+        """Return the context of the plugin's download history."""
+        return {
+            "slug": record["slug"],
+            "last_updated": record.get("last_updated"),
+            "downloaded": record.get("downloaded"),
+        }
 
-    def get_next_page_token(self, response, previous_token) -> Optional[Any]:
+    def get_next_page_token(
+        self, response: requests.Response, previous_token: Optional[Any]
+    ) -> Optional[Any]:
         """Return the next page token."""
         if self._stop_pagination:
             return None
 
-        data = response.json()
+        data = self.response_json(response)
         if "info" in data:
             current_page = data["info"].get("page", 1)
             total_pages = data["info"].get("pages", 1)
-            if current_page < total_pages:
-                return current_page + 1
+            if current_page + self.page_step <= total_pages:
+                return current_page + self.page_step
         return None
 
+    def get_page_tokens(self, response: requests.Response) -> Optional[List[Any]]:
+        """Return the numbers of the pages after the current one."""
+        info = self.response_json(response).get("info", {})
+        current_page = info.get("page", 1)
+        total_pages = info.get("pages", 1)
+        return list(
+            range(current_page + self.page_step, total_pages + 1, self.page_step)
+        )
+
+
+class PluginDownloadsStream(WordPressOrgAPIStream):
+    """Daily download counts of each plugin, synced per plugin slug."""
+
+    name = "plugin_downloads"
+    path = "/stats/plugin/1.0/downloads.php"
+    parent_stream_type = PluginsStream
+    primary_keys = ["slug", "date"]
+    replication_key = "date"
+    state_partitioning_keys = ["slug"]
+    selected_by_default = False
+    # The bookmark day is requested again, as its count grows until midnight
+    bookmark_inclusive = True
+
+    # Download counts change at most daily
+    http_cache_ttl = 12 * 60 * 60
+
+    schema = th.PropertiesList(
+        th.Property("slug", th.StringType, description="Plugin slug"),
+        th.Property("date", th.DateType, description="Day of the downloads"),
+        th.Property("downloads", th.IntegerType, description="Downloads that day"),
+    ).to_dict()
+
+    def get_url_params(
+        self, context: Optional[dict], next_page_token: Optional[Any]
+    ) -> Dict[str, Any]:
+        """Return URL parameters for a plugin's download history."""
+        params: Dict[str, Any] = {"slug": (context or {}).get("slug")}
+        # Only request the days since the slug's bookmark
+        bookmark = parse_timestamp(self.get_starting_replication_key_value(context))
+        if bookmark is not None:
+            days = (datetime.now(timezone.utc) - bookmark).days
+            params["limit"] = max(days + 1, 1)
+        return params
+
+    def _parent_signature(self, context: dict) -> str:
+        return f"{context.get('last_updated')}|{context.get('downloaded')}"
+
+    def needs_refresh(self, context: dict) -> bool:
+        """Return whether a slug's history must be requested again."""
+        if not self.config.get("plugin_downloads_changed_only", False):
+            return True
+        state = self.get_context_state(context)
+        return state.get("parent_signature") != self._parent_signature(context)
+
+    def prefetch(self, contexts: List[dict]) -> None:
+        """Request the history of the slugs that need a refresh concurrently."""
+        contexts = [context for context in contexts if self.needs_refresh(context)]
+        if contexts:
+            super().prefetch(contexts)
+
+    def get_records(self, context: Optional[dict]) -> Iterator[dict]:
+        """Return a slug's download history, skipping unchanged plugins."""
+        if context and not self.needs_refresh(context):
+            self.logger.debug(f"Skipping unchanged plugin {context.get('slug')}")
+            return
+
+        yield from super().get_records(context)
+        if context:
+            with self._state_lock:
+                state = self.get_context_state(context)
+                state["parent_signature"] = self._parent_signature(context)
+
+    def parse_response(self, response: Any) -> Iterator[dict]:
+        """Parse the date to download count map into records."""
+        data = self.response_json(response)
+        if not isinstance(data, dict):
+            # Unknown slugs return an empty list
+            return
+
+        slug = (self._partition_context or {}).get("slug")
+        for day, downloads in data.items():
+            yield {"slug": slug, "date": day, "downloads": int(downloads)}
+
+    @timed_post_process
+    def post_process(self, row: dict, context: Optional[dict] = None) -> Optional[dict]:
+        """Drop days before the slug's bookmark, keeping the bookmark day."""
+        return self._filter_by_replication_key(row, context)
+
 
 class ThemesStream(WordPressOrgAPIStream):
     """Themes stream."""
@@ -161,6 +292,43 @@ class ThemesStream(WordPressOrgAPIStream):
     primary_keys = ["slug"]
     replication_key = "last_updated_time"
     records_jsonpath = "$.themes[*]"
+    parallel_pagination = True
+    newest_first = True
+    shardable = True
+    field_param_template = "request[fields][{}]"
+    slug_list_setting = "theme_slugs"
+    resumable_pagination = True
+    browse = "updated"
+    required_record_fields = ("slug",)
+    decode_entities = True
+    false_to_null_fields = ("requires_php", "requires")
+    zero_date_fields = ("last_updated",)
+    change_detection = True
+    # last_updated_time is only returned alongside the last_updated field
+    required_fields = ("last_updated",)
+    default_fields = frozenset(
+        {
+            "slug",
+            "name",
+            "version",
+            "preview_url",
+            "author",
+            "screenshot_url",
+            "rating",
+            "num_ratings",
+            "homepage",
+            "requires",
+            "requires_php",
+        }
+    )
+    lookup_default_fields = default_fields | {
+        "downloaded",
+        "last_updated",
+        "last_updated_time",
+        "sections",
+        "tags",
+        "download_link",
+    }
 
     schema = th.PropertiesList(
         th.Property("slug", th.StringType, description="Theme slug"),
@@ -199,60 +367,50 @@ class ThemesStream(WordPressOrgAPIStream):
         """Return URL parameters for theme search."""
         params = {
             "action": "query_themes",
-            "request[per_page]": 100,
-            "request[browse]": "updated",
+            "request[per_page]": self.config.get("page_size", 100),
+            "request[browse]": self.browse,
             "request[fields][last_updated]": "true",
+            **self.get_field_params(),
         }
-        if next_page_token:
-            params["request[page]"] = next_page_token
+        page = next_page_token or self.get_first_page(context)
+        if page > 1:
+            params["request[page]"] = page
 
         return params
 
-    def post_process(self, row: dict, context: Optional[dict] = None) -> Optional[dict]:
-        """Post-process record with custom transformations."""
-        try:
-            # Validate required fields
-            if not row.get("slug"):
-                self.logger.warning(
-                    f"Skipping theme record missing required 'slug' field: {row}"
-                )
-                return None
-
-            # Custom transformation: HTML entity decoding
-            if row.get("name"):
-                row["name"] = row["name"].replace("&#8211;", "–").replace("&amp;", "&")
-
-            # Custom transformation: Normalize boolean fields to null
-            for field in ["requires_php", "requires"]:
-                if row.get(field) is False:
-                    row[field] = None
-
-            # Handle invalid date values
-            if row.get("last_updated") == "0000-00-00 00:00:00":
-                row["last_updated"] = None
-
-            return self._filter_by_replication_key(row, context)
-
-        except Exception as e:
-            self.logger.error(
-                f"Error processing theme record {row.get('slug', 'unknown')}: {e}"
-            )
-            # Return original record rather than failing completely
-            return row
+    def get_lookup_params(self, slug: str) -> Dict[str, Any]:
+        """Return URL parameters for a single theme's information."""
+        return {
+            "action": "theme_information",
+            "request[slug]": slug,
+            "request[fields][last_updated]": "true",
+            **self.get_field_params(lookup=True),
+        }
 
-    def get_next_page_token(self, response, previous_token) -> Optional[Any]:
+    def get_next_page_token(
+        self, response: requests.Response, previous_token: Optional[Any]
+    ) -> Optional[Any]:
         """Return the next page token."""
         if self._stop_pagination:
             return None
 
-        data = response.json()
+        data = self.response_json(response)
         if "info" in data:
             current_page = data["info"].get("page", 1)
             total_pages = data["info"].get("pages", 1)
-            if current_page < total_pages:
-                return current_page + 1
+            if current_page + self.page_step <= total_pages:
+                return current_page + self.page_step
         return None
 
+    def get_page_tokens(self, response: requests.Response) -> Optional[List[Any]]:
+        """Return the numbers of the pages after the current one."""
+        info = self.response_json(response).get("info", {})
+        current_page = info.get("page", 1)
+        total_pages = info.get("pages", 1)
+        return list(
+            range(current_page + self.page_step, total_pages + 1, self.page_step)
+        )
+
 
 class EventsStream(WordPressOrgAPIStream):
     """Events stream."""
@@ -287,6 +445,11 @@ class EventsStream(WordPressOrgAPIStream):
         ),
     ).to_dict()
 
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._locations_prefetched = False
+        self._seen_urls: Set[str] = set()
+
     def get_url_params(
         self, context: Optional[dict], next_page_token: Optional[Any]
     ) -> Dict[str, Any]:
@@ -294,12 +457,39 @@ class EventsStream(WordPressOrgAPIStream):
         params = {
             "number": 100,
         }
-        if self.config.get("events_location"):
+        if context and context.get("location"):
+            params["location"] = context["location"]
+        elif self.config.get("events_location"):
             params["location"] = self.config.get("events_location")
         if self.config.get("events_ip"):
             params["ip"] = self.config.get("events_ip")
         return params
 
+    @property
+    def partitions(self) -> Optional[List[dict]]:
+        """Return one partition per configured events location."""
+        locations = self.config.get("events_locations")
+        if not locations:
+            return super().partitions
+        return [{"location": location} for location in dict.fromkeys(locations)]
+
+    def get_records(self, context: Optional[dict]) -> Iterator[dict]:
+        """Return the events of one location, prefetching every location first."""
+        if context and "location" in context and not self._locations_prefetched:
+            self._locations_prefetched = True
+            self.prefetch(self.partitions or [])
+        yield from super().get_records(context)
+
+    @timed_post_process
+    def post_process(self, row: dict, context: Optional[dict] = None) -> Optional[dict]:
+        """Drop events already emitted for another location."""
+        url = row.get("url")
+        if url:
+            if url in self._seen_urls:
+                return None
+            self._seen_urls.add(url)
+        return row
+
 
 class PatternsStream(WordPressOrgAPIStream):
     """Block patterns stream."""
@@ -309,6 +499,10 @@ class PatternsStream(WordPressOrgAPIStream):
     primary_keys = ["id"]
     replication_key = None
     records_jsonpath = "$.patterns[*]"
+    parallel_pagination = True
+    resumable_pagination = True
+    cursor_token_name = "offset"
+    per_page = 100
 
     schema = th.PropertiesList(
         th.Property("id", th.IntegerType, description="Pattern ID"),
@@ -363,31 +557,62 @@ class PatternsStream(WordPressOrgAPIStream):
     ) -> Dict[str, Any]:
         """Return URL parameters for patterns."""
         params = {
-            "per_page": 100,
+            "per_page": self.per_page,
         }
         if next_page_token:
             params["offset"] = next_page_token
         return params
 
-    def get_next_page_token(self, response, previous_token) -> Optional[Any]:
+    def get_total(self, response: requests.Response) -> Optional[int]:
+        """Return the total number of patterns reported by the response headers."""
+        total = response.headers.get("X-WP-Total")
+        if total is not None and total.isdigit():
+            return int(total)
+        total_pages = response.headers.get("X-WP-TotalPages")
+        if total_pages is not None and total_pages.isdigit():
+            return int(total_pages) * self.per_page
+        return None
+
+    def get_next_page_token(
+        self, response: requests.Response, previous_token: Optional[Any]
+    ) -> Optional[Any]:
         """Return the next page token."""
-        data = response.json()
-        if "patterns" in data and len(data["patterns"]) == 100:
-            current_offset = previous_token or 0
-            return current_offset + 100
+        next_offset = (previous_token or 0) + self.per_page
+        total = self.get_total(response)
+        if total is not None:
+            # Stop at the last page instead of requesting an empty one
+            return next_offset if next_offset < total else None
+
+        data = self.response_json(response)
+        if "patterns" in data and len(data["patterns"]) == self.per_page:
+            return next_offset
         return None
 
+    def get_previous_page_token(self, token: Any) -> Optional[Any]:
+        """Return the offset of the page before a page, or None on the first one."""
+        return token - self.per_page if token >= self.per_page else None
+
+    def get_page_tokens(self, response: requests.Response) -> Optional[List[Any]]:
+        """Return the offsets of the pages after the first one, if known."""
+        total = self.get_total(response)
+        if total is None:
+            return None
+        return list(range(self.per_page, total, self.per_page))
 
-class WordPressStatsStream(WordPressOrgAPIStream):
+
+class WordPressStatsStream(WordPressOrgStatsStream):
     """WordPress version statistics stream."""
 
     name = "wordpress_stats"
     path = "/stats/wordpress/1.0/"
-    primary_keys = ["version"]
-    replication_key = None
-    records_jsonpath = "$[*]"
+    primary_keys = ["group", "version"]
 
     schema = th.PropertiesList(
+        th.Property(
+            "group",
+            th.StringType,
+            description="Path of the nested group, empty for top-level entries",
+        ),
         th.Property("version", th.StringType, description="WordPress version"),
         th.Property("count", th.IntegerType, description="Number of installations"),
         th.Property(
@@ -395,35 +620,20 @@ class WordPressStatsStream(WordPressOrgAPIStream):
         ),
     ).to_dict()
 
-    def parse_response(self, response):
-        """Parse the WordPress stats response."""
-        data = response.json()
-        records = []
-        for version, count in data.items():
-            records.append(
-                {
-                    "version": version,
-                    "count": int(count),
-                    "percent": (
-                        float(count) / sum(int(v) for v in data.values()) * 100
-                        if data
-                        else 0
-                    ),
-                }
-            )
-        return records
-
-
-class PHPStatsStream(WordPressOrgAPIStream):
+
+class PHPStatsStream(WordPressOrgStatsStream):
     """PHP version statistics stream."""
 
     name = "php_stats"
     path = "/stats/php/1.0/"
-    primary_keys = ["version"]
-    replication_key = None
-    records_jsonpath = "$[*]"
+    primary_keys = ["group", "version"]
 
     schema = th.PropertiesList(
+        th.Property(
+            "group",
+            th.StringType,
+            description="Path of the nested group, empty for top-level entries",
+        ),
         th.Property("version", th.StringType, description="PHP version"),
         th.Property("count", th.IntegerType, description="Number of installations"),
         th.Property(
@@ -431,35 +641,20 @@ class PHPStatsStream(WordPressOrgAPIStream):
         ),
     ).to_dict()
 
-    def parse_response(self, response):
-        """Parse the PHP stats response."""
-        data = response.json()
-        records = []
-        for version, count in data.items():
-            records.append(
-                {
-                    "version": version,
-                    "count": int(count),
-                    "percent": (
-                        float(count) / sum(int(v) for v in data.values()) * 100
-                        if data
-                        else 0
-                    ),
-                }
-            )
-        return records
-
-
-class MySQLStatsStream(WordPressOrgAPIStream):
+
+class MySQLStatsStream(WordPressOrgStatsStream):
     """MySQL version statistics stream."""
 
     name = "mysql_stats"
     path = "/stats/mysql/1.0/"
-    primary_keys = ["version"]
-    replication_key = None
-    records_jsonpath = "$[*]"
+    primary_keys = ["group", "version"]
 
     schema = th.PropertiesList(
+        th.Property(
+            "group",
+            th.StringType,
+            description="Path of the nested group, empty for top-level entries",
+        ),
         th.Property("version", th.StringType, description="MySQL version"),
         th.Property("count", th.IntegerType, description="Number of installations"),
         th.Property(
@@ -467,56 +662,24 @@ class MySQLStatsStream(WordPressOrgAPIStream):
         ),
     ).to_dict()
 
-    def parse_response(self, response):
-        """Parse the MySQL stats response."""
-        data = response.json()
-        records = []
-        for version, count in data.items():
-            records.append(
-                {
-                    "version": version,
-                    "count": int(count),
-                    "percent": (
-                        float(count) / sum(int(v) for v in data.values()) * 100
-                        if data
-                        else 0
-                    ),
-                }
-            )
-        return records
-
-
-class LocaleStatsStream(WordPressOrgAPIStream):
+
+class LocaleStatsStream(WordPressOrgStatsStream):
     """Locale/Language statistics stream."""
 
     name = "locale_stats"
     path = "/stats/locale/1.0/"
-    primary_keys = ["locale"]
-    replication_key = None
-    records_jsonpath = "$[*]"
+    primary_keys = ["group", "locale"]
+    stats_key = "locale"
 
     schema = th.PropertiesList(
+        th.Property(
+            "group",
+            th.StringType,
+            description="Path of the nested group, empty for top-level entries",
+        ),
         th.Property("locale", th.StringType, description="Locale code"),
         th.Property("count", th.IntegerType, description="Number of installations"),
         th.Property(
             "percent", th.NumberType, description="Percentage of total installations"
         ),
     ).to_dict()
-
-    def parse_response(self, response):
-        """Parse the locale stats response."""
-        data = response.json()
-        records = []
-        for locale, count in data.items():
-            records.append(
-                {
-                    "locale": locale,
-                    "count": int(count),
-                    "percent": (
-                        float(count) / sum(int(v) for v in data.values()) * 100
-                        if data
-                        else 0
-                    ),
-                }
-            )
-        return records
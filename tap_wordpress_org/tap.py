@@ -2,17 +2,38 @@
 
 from __future__ import annotations
 
-from typing import List
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import List, Optional, Set, Tuple
 
+import requests
 from singer_sdk import Stream, Tap
 from singer_sdk import typing as th
+from singer_sdk.io_base import SingerWriter
+from singer_sdk.singerlib import Message, StateMessage
 
+from tap_wordpress_org import client
+from tap_wordpress_org.cache import HTTPResponseCache
+from tap_wordpress_org.client import (
+    JSON_BACKENDS,
+    WordPressOrgAPIStream,
+    get_json_backend,
+)
+from tap_wordpress_org.fingerprints import FingerprintIndex
+from tap_wordpress_org.instrumentation import log_stream_stats, write_prometheus
+from tap_wordpress_org.profiling import SyncProfiler
+from tap_wordpress_org.ratelimit import TokenBucketRateLimiter
+from tap_wordpress_org.replay import ARCHIVE_MODES
+from tap_wordpress_org.session import create_session, get_pool_stats
 from tap_wordpress_org.streams import (
     EventsStream,
     LocaleStatsStream,
     MySQLStatsStream,
     PatternsStream,
     PHPStatsStream,
+    PluginDownloadsStream,
     PluginsStream,
     ThemesStream,
     WordPressStatsStream,
@@ -20,6 +41,7 @@ from tap_wordpress_org.streams import (
 
 STREAM_TYPES = [
     PluginsStream,
+    PluginDownloadsStream,
     ThemesStream,
     EventsStream,
     PatternsStream,
@@ -30,10 +52,31 @@ STREAM_TYPES = [
 ]
 
 
+class WordPressOrgSingerWriter(SingerWriter):
+    """Singer message writer using a pluggable JSON backend."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.json_backend = get_json_backend()
+        self._lock = threading.Lock()
+
+    def serialize_message(self, message: Message) -> str:
+        """Serialize a Singer message into a line of JSON."""
+        return self.json_backend.dumps(message.to_dict())
+
+    def write_message(self, message: Message) -> None:
+        """Write a message to stdout, one whole line at a time across threads."""
+        line = self.format_message(message) + "\n"
+        with self._lock:
+            sys.stdout.write(line)
+            sys.stdout.flush()
+
+
 class TapWordPressOrg(Tap):
     """WordPress.org tap class."""
 
     name = "tap-wordpress-org"
+    message_writer_class = WordPressOrgSingerWriter
 
     config_jsonschema = th.PropertiesList(
         th.Property(
@@ -53,6 +96,14 @@ class TapWordPressOrg(Tap):
             th.StringType,
             description="Location for events search (e.g., 'Seattle, WA')",
         ),
+        th.Property(
+            "events_locations",
+            th.ArrayType(th.StringType),
+            description=(
+                "Locations whose events are fetched concurrently and de-duplicated "
+                "by URL (overrides events_location)"
+            ),
+        ),
         th.Property(
             "events_ip",
             th.StringType,
@@ -72,10 +123,415 @@ class TapWordPressOrg(Tap):
             "request_delay",
             th.NumberType,
             default=0.1,
-            description="Delay between API requests in seconds (default: 0.1)",
+            description=(
+                "Delay between API requests in seconds (default: 0.1), used to "
+                "derive requests_per_second when that is not set"
+            ),
+        ),
+        th.Property(
+            "requests_per_second",
+            th.NumberType,
+            description=(
+                "Sustained request rate shared by all streams; 0 disables rate "
+                "limiting (default: 1 / request_delay)"
+            ),
+        ),
+        th.Property(
+            "burst_size",
+            th.IntegerType,
+            default=1,
+            description="Number of requests allowed in a burst (default: 1)",
+        ),
+        th.Property(
+            "http_cache_path",
+            th.StringType,
+            description=(
+                "Path of a SQLite file caching API responses between runs; "
+                "caching is disabled when unset"
+            ),
+        ),
+        th.Property(
+            "http_cache_ttls",
+            th.ObjectType(additional_properties=th.NumberType),
+            description=(
+                "Seconds a cached response is reused without revalidation, by "
+                "stream name (default: 12 hours for stats streams, else 0)"
+            ),
+        ),
+        th.Property(
+            "http_cache_max_size_mb",
+            th.NumberType,
+            default=512,
+            description="Maximum size of cached response bodies in MB (default: 512)",
+        ),
+        th.Property(
+            "fingerprint_index_path",
+            th.StringType,
+            description=(
+                "Path of a SQLite file holding plugin/theme content hashes; when "
+                "set, records unchanged since the last run are not emitted"
+            ),
+        ),
+        th.Property(
+            "force_full_emission",
+            th.BooleanType,
+            default=False,
+            description=(
+                "Emit every plugin/theme record even when its fingerprint is "
+                "unchanged (default: false)"
+            ),
+        ),
+        th.Property(
+            "json_backend",
+            th.StringType,
+            default="auto",
+            allowed_values=list(JSON_BACKENDS),
+            description=(
+                "JSON library used to decode responses and serialize messages: "
+                "'auto' picks orjson or msgspec when installed, else 'json'"
+            ),
+        ),
+        th.Property(
+            "streaming_parse",
+            th.BooleanType,
+            default=False,
+            description=(
+                "Parse records incrementally while the response body arrives; "
+                "requires the ijson package (default: false)"
+            ),
+        ),
+        th.Property(
+            "page_size",
+            th.IntegerType,
+            default=100,
+            description="Records requested per page for plugins/themes (default: 100)",
+        ),
+        th.Property(
+            "field_projection",
+            th.BooleanType,
+            default=False,
+            description=(
+                "Request only the plugin/theme fields selected in the catalog "
+                "(default: false)"
+            ),
+        ),
+        th.Property(
+            "shard_count",
+            th.IntegerType,
+            default=1,
+            description=(
+                "Number of workers splitting the plugins/themes pages between "
+                "them (default: 1, no sharding)"
+            ),
+        ),
+        th.Property(
+            "shard_index",
+            th.IntegerType,
+            default=0,
+            description="Zero-based shard crawled by this worker (default: 0)",
+        ),
+        th.Property(
+            "pagination_checkpoint_pages",
+            th.IntegerType,
+            default=10,
+            description=(
+                "Pages between checkpoints of the plugins/themes/patterns crawl "
+                "position, 0 to disable (default: 10)"
+            ),
+        ),
+        th.Property(
+            "http_pool_connections",
+            th.IntegerType,
+            default=10,
+            description="Number of hosts whose connections are pooled (default: 10)",
+        ),
+        th.Property(
+            "http_pool_maxsize",
+            th.IntegerType,
+            description=(
+                "Connections kept open per host (default: the larger of 10 and "
+                "max_concurrency)"
+            ),
+        ),
+        th.Property(
+            "http_keep_alive",
+            th.BooleanType,
+            default=True,
+            description="Reuse connections between requests (default: true)",
+        ),
+        th.Property(
+            "http_archive",
+            th.StringType,
+            description=(
+                "Path of a gzipped archive of API responses to record to or "
+                "replay from (default: none, use the network)"
+            ),
+        ),
+        th.Property(
+            "http_archive_mode",
+            th.StringType,
+            default="replay",
+            allowed_values=list(ARCHIVE_MODES),
+            description=(
+                "'record' saves every response to http_archive, 'replay' serves "
+                "responses from it without the network (default: replay)"
+            ),
+        ),
+        th.Property(
+            "replay_latency",
+            th.NumberType,
+            default=0.0,
+            description="Seconds each replayed response is delayed (default: 0)",
+        ),
+        th.Property(
+            "replay_jitter",
+            th.NumberType,
+            default=0.0,
+            description=(
+                "Maximum random seconds added to or removed from the replay "
+                "latency (default: 0)"
+            ),
+        ),
+        th.Property(
+            "metrics_textfile",
+            th.StringType,
+            description=(
+                "Path of a Prometheus textfile written at the end of the run with "
+                "request latency, bytes, decode and transform time, dropped "
+                "records and rate limiter waits (default: none)"
+            ),
+        ),
+        th.Property(
+            "profile_output",
+            th.StringType,
+            description=(
+                "Path of a pstats file written by running the sync under cProfile, "
+                "with per-stream timings and the top functions printed to stderr "
+                "(default: none, no profiling)"
+            ),
+        ),
+        th.Property(
+            "profile_top",
+            th.IntegerType,
+            default=25,
+            description="Number of functions in the profile summary (default: 25)",
+        ),
+        th.Property(
+            "decode_entities_fields",
+            th.ArrayType(th.StringType),
+            default=["name", "short_description"],
+            description=(
+                "Plugin/theme fields whose HTML entities are decoded, e.g. add "
+                "'sections' to decode the section content (default: name, "
+                "short_description)"
+            ),
+        ),
+        th.Property(
+            "plugin_slugs",
+            th.ArrayType(th.StringType),
+            description=(
+                "Plugin slugs to look up individually instead of listing every "
+                "plugin"
+            ),
+        ),
+        th.Property(
+            "theme_slugs",
+            th.ArrayType(th.StringType),
+            description=(
+                "Theme slugs to look up individually instead of listing every theme"
+            ),
+        ),
+        th.Property(
+            "child_batch_size",
+            th.IntegerType,
+            default=100,
+            description=(
+                "Child contexts, such as plugin slugs, prefetched concurrently per "
+                "batch (default: 100)"
+            ),
+        ),
+        th.Property(
+            "plugin_downloads_changed_only",
+            th.BooleanType,
+            default=False,
+            description=(
+                "Only refresh the download history of plugins whose last_updated "
+                "or downloaded value changed (default: false)"
+            ),
+        ),
+        th.Property(
+            "max_stream_concurrency",
+            th.IntegerType,
+            default=1,
+            description="Maximum number of streams synced at once (default: 1)",
+        ),
+        th.Property(
+            "max_concurrency",
+            th.IntegerType,
+            default=1,
+            description=(
+                "Maximum number of pages or event locations fetched concurrently "
+                "(default: 1, sequential)"
+            ),
         ),
     ).to_dict()
 
+    def __init__(self, *args, **kwargs):
+        self._http_session: Optional[requests.Session] = None
+        self._ended_streams: Set[str] = set()
+        super().__init__(*args, **kwargs)
+        if isinstance(self.message_writer, WordPressOrgSingerWriter):
+            self.message_writer.json_backend = get_json_backend(
+                self.config.get("json_backend", "auto")
+            )
+        if self.config.get("streaming_parse") and client.ijson is None:
+            self.logger.warning(
+                "streaming_parse is enabled but ijson is not installed, "
+                "falling back to buffered parsing"
+            )
+
+    @property
+    def http_session(self) -> requests.Session:
+        """Return the pooled HTTP session shared by all streams."""
+        if self._http_session is None:
+            self._http_session = create_session(self.config)
+        return self._http_session
+
+    @classmethod
+    def invoke(  # type: ignore[override]
+        cls,
+        *,
+        about: bool = False,
+        about_format: Optional[str] = None,
+        config: Tuple[str, ...] = (),
+        state: Optional[Path] = None,
+        catalog: Optional[Path] = None,
+    ) -> None:
+        """Invoke the tap's command line interface.
+
+        Builds the tap from the command line arguments like ``Tap.invoke``,
+        then runs sync_streams, under the profiler when profile_output is set.
+        """
+        # The plugin base class handles --about, Tap.invoke would also sync
+        super(Tap, cls).invoke(about=about, about_format=about_format)
+        cls.print_version(print_fn=cls.logger.info)
+        config_files, parse_env_config = cls.config_from_cli_args(*config)
+        tap = cls(
+            config=config_files,  # type: ignore[arg-type]
+            state=state,
+            catalog=catalog,
+            parse_env_config=parse_env_config,
+            validate_config=True,
+        )
+
+        profile_output = tap.config.get("profile_output")
+        if not profile_output:
+            tap.sync_streams()
+            return
+
+        profiler = SyncProfiler(
+            tap.streams.values(),
+            profile_output,
+            top=tap.config.get("profile_top", 25),
+        )
+        with profiler:
+            tap.sync_streams()
+
+    def sync_streams(self) -> None:
+        """Sync all streams, several at a time when max_stream_concurrency is set.
+
+        This is the sync run from the command line. Without concurrency, it is
+        the SDK's sync_all.
+        """
+        max_workers = self.config.get("max_stream_concurrency", 1)
+        if max_workers > 1:
+            self._sync_concurrently(max_workers)
+        else:
+            self.sync_all()
+
+    def _stream_sync_ended(self, stream: Stream) -> None:
+        """Finish the sync once every stream has logged its sync costs.
+
+        Streams log their costs once, after all streams have synced, so the
+        last one stands in for a teardown hook.
+        """
+        self._ended_streams.add(stream.name)
+        if self._ended_streams >= set(self.streams):
+            self._ended_streams.clear()
+            self._finish_sync()
+
+    def _finish_sync(self) -> None:
+        """Log how HTTP connections were reused and close the shared session."""
+        stats = get_pool_stats(self.http_session)
+        self.logger.info(
+            f"HTTP connection pool: {stats['requests']} requests over "
+            f"{stats['new_connections']} new connections "
+            f"({stats['reused_connections']} reused)"
+        )
+        # Closing the session also finishes a recorded archive
+        self.http_session.close()
+        self._report_instrumentation()
+
+    def _report_instrumentation(self) -> None:
+        """Log the streams' timings and counters, and write the textfile."""
+        stats = {
+            stream.name: stream.instrumentation
+            for stream in self.streams.values()
+            if isinstance(stream, WordPressOrgAPIStream)
+        }
+        log_stream_stats(stats)
+        textfile = self.config.get("metrics_textfile")
+        if textfile:
+            write_prometheus(textfile, stats)
+
+    def _sync_concurrently(self, max_workers: int) -> None:
+        """Sync the selected top-level streams on a pool of worker threads.
+
+        Each stream runs its own sync, as in ``Tap.sync_all``, through the
+        streams' public sync methods. Messages go through the shared writer
+        one line at a time, and streams hold a shared lock for every state
+        write, so each stream still writes SCHEMA before its RECORDs and STATE
+        stays consistent. No stream ignores its parent's replication key, so
+        the replication methods never need the fixups sync_all applies.
+        """
+        bookmarks = self.state.get("bookmarks", {})
+        for stream in self.streams.values():
+            # Clear the progress markers of previous runs, in every partition
+            stream_state = bookmarks.get(stream.name)
+            if stream_state:
+                for state in [stream_state, *stream_state.get("partitions", [])]:
+                    stream.reset_state_progress_markers(state)
+        if self.state:
+            self.write_message(StateMessage(value=self.state))
+
+        streams = []
+        for stream in self.streams.values():
+            if not stream.selected and not stream.has_selected_descendents:
+                self.logger.info("Skipping deselected stream '%s'.", stream.name)
+                continue
+            if stream.parent_stream_type:
+                continue
+            streams.append(stream)
+
+        def sync_stream(stream: Stream) -> None:
+            stream.sync()
+            stream.finalize_state_progress_markers()
+
+        self.logger.info(
+            f"Syncing {len(streams)} streams with up to {max_workers} workers"
+        )
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = [executor.submit(sync_stream, stream) for stream in streams]
+            try:
+                for future in futures:
+                    future.result()
+            finally:
+                for future in futures:
+                    future.cancel()
+
+        for stream in self.streams.values():
+            stream.log_sync_costs()
+
     def discover_streams(self) -> List[Stream]:
         """Return a list of discovered streams."""
         all_streams = [
@@ -83,6 +539,17 @@ class TapWordPressOrg(Tap):
             for stream_class in STREAM_TYPES
         ]
 
+        # Share the HTTP session, rate limiter, response cache and fingerprint index
+        rate_limiter = TokenBucketRateLimiter.from_config(self.config)
+        http_cache = HTTPResponseCache.from_config(self.config)
+        fingerprint_index = FingerprintIndex.from_config(self.config)
+        for stream in all_streams:
+            stream.requests_session = self.http_session
+            stream.rate_limiter = rate_limiter
+            stream.http_cache = http_cache
+            stream.fingerprint_index = fingerprint_index
+            stream.on_sync_end = self._stream_sync_ended
+
         # Filter streams based on configuration
         stream_selection = self.config.get("stream_selection")
         if stream_selection:
@@ -0,0 +1,123 @@
+"""Record transformations shared by the plugin and theme streams."""
+
+from __future__ import annotations
+
+import html
+import re
+from functools import lru_cache
+from typing import Any, Callable, Iterable, Optional, Sequence, Tuple
+
+#: Fields whose HTML entities are decoded unless configured otherwise
+DEFAULT_ENTITY_FIELDS = ("name", "short_description")
+
+# The pattern html.unescape uses, so decoded text is identical to its output
+_ENTITY_RE = re.compile(r"&(#[0-9]+;?|#[xX][0-9a-fA-F]+;?|[^\t\n\f <&#;]{1,32};?)")
+
+
+@lru_cache(maxsize=4096)
+def _decode_entity(entity: str) -> str:
+    return html.unescape(entity)
+
+
+def _replace_entity(match: re.Match) -> str:
+    return _decode_entity(match.group(0))
+
+
+def decode_entities(value: Any) -> Any:
+    """Decode every HTML entity in a string, or in the strings of a dict or list.
+
+    Strings are decoded in a single regex pass, with each distinct entity
+    resolved once and then served from a lookup table. Strings without an
+    ``&`` are returned as is.
+    """
+    if isinstance(value, str):
+        return _ENTITY_RE.sub(_replace_entity, value) if "&" in value else value
+    if isinstance(value, dict):
+        return {key: decode_entities(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [decode_entities(item) for item in value]
+    return value
+
+
+#: Values the API uses for unknown dates
+ZERO_DATES = ("0000-00-00 00:00:00", "0000-00-00")
+
+#: A record transformation, returning None to drop the record
+Transform = Callable[[dict], Optional[dict]]
+
+
+def require_fields(
+    fields: Sequence[str], on_missing: Callable[[dict, str], None]
+) -> Optional[Transform]:
+    """Return a transform dropping records that lack one of the fields."""
+    if not fields:
+        return None
+
+    def require(row: dict) -> Optional[dict]:
+        for field in fields:
+            if not row.get(field):
+                on_missing(row, field)
+                return None
+        return row
+
+    return require
+
+
+def decode_fields(fields: Sequence[str]) -> Optional[Transform]:
+    """Return a transform decoding the HTML entities of the fields."""
+    if not fields:
+        return None
+
+    def decode(row: dict) -> dict:
+        for field in fields:
+            value = row.get(field)
+            if value:
+                row[field] = decode_entities(value)
+        return row
+
+    return decode
+
+
+def false_to_null(fields: Sequence[str]) -> Optional[Transform]:
+    """Return a transform replacing ``false`` with null in the fields."""
+    if not fields:
+        return None
+
+    def nullify(row: dict) -> dict:
+        for field in fields:
+            if row.get(field) is False:
+                row[field] = None
+        return row
+
+    return nullify
+
+
+def zero_dates_to_null(fields: Sequence[str]) -> Optional[Transform]:
+    """Return a transform replacing zero dates with null in the fields."""
+    if not fields:
+        return None
+
+    def nullify(row: dict) -> dict:
+        for field in fields:
+            if row.get(field) in ZERO_DATES:
+                row[field] = None
+        return row
+
+    return nullify
+
+
+class TransformPipeline:
+    """Record transforms compiled once into a flat list and applied in order."""
+
+    def __init__(self, transforms: Iterable[Optional[Transform]]):
+        self.transforms: Tuple[Transform, ...] = tuple(
+            transform for transform in transforms if transform is not None
+        )
+
+    def __call__(self, row: dict) -> Optional[dict]:
+        """Transform one record, returning None when it is dropped."""
+        for transform in self.transforms:
+            row = transform(row)
+            if row is None:
+                return None
+        return row
@@ -0,0 +1,122 @@
+"""Test the persistent HTTP response cache."""
+
+import time
+from unittest.mock import Mock
+
+import requests
+
+from tap_wordpress_org.cache import HTTPResponseCache
+from tap_wordpress_org.streams import PHPStatsStream, PluginsStream
+
+
+def make_response(body, status_code=200, headers=None):
+    """Build a requests.Response with a raw body."""
+    response = requests.Response()
+    response.status_code = status_code
+    response.headers.update(headers or {})
+    response._content = body
+    return response
+
+
+def make_stream(stream_class, tmp_path, **config):
+    """Build a stream whose HTTP session sends nothing over the network."""
+    tap_mock = Mock()
+    tap_mock.config = {
+        "request_delay": 0,
+        "http_cache_path": str(tmp_path / "cache.sqlite"),
+        **config,
+    }
+    stream = stream_class(tap=tap_mock)
+    stream._requests_session = requests.Session()
+    stream._requests_session.send = Mock()
+    return stream
+
+
+def test_store_and_get(tmp_path):
+    """Test entries round-trip with their validators."""
+    cache = HTTPResponseCache(str(tmp_path / "cache.sqlite"))
+    cache.store("GET /a", make_response(b"{}", headers={"ETag": '"v1"'}))
+
+    entry = cache.get("GET /a")
+    assert entry.body == b"{}"
+    assert entry.conditional_headers() == {"If-None-Match": '"v1"'}
+    assert cache.get("GET /b") is None
+
+
+def test_from_config_disabled_without_path():
+    """Test caching is off unless a path is configured."""
+    assert HTTPResponseCache.from_config({}) is None
+
+
+def test_eviction_drops_least_recently_used(tmp_path):
+    """Test size-based eviction keeps the most recently used entries."""
+    cache = HTTPResponseCache(str(tmp_path / "cache.sqlite"), max_size_bytes=20)
+    cache.store("GET /a", make_response(b"a" * 10))
+    time.sleep(0.01)
+    cache.store("GET /b", make_response(b"b" * 10))
+    time.sleep(0.01)
+    cache.get("GET /a")
+    time.sleep(0.01)
+    cache.store("GET /c", make_response(b"c" * 10))
+
+    assert cache.get("GET /a") is not None
+    assert cache.get("GET /b") is None
+    assert cache.get("GET /c") is not None
+
+
+def test_not_modified_served_from_cache(tmp_path):
+    """Test a 304 revalidation returns the cached body."""
+    stream = make_stream(PluginsStream, tmp_path)
+    stream._requests_session.send.side_effect = [
+        make_response(b'{"plugins": []}', headers={"ETag": '"v1"'}),
+        make_response(b"", status_code=304),
+    ]
+    prepared = stream.prepare_request(context=None, next_page_token=None)
+
+    first = stream._request(prepared, None)
+    prepared = stream.prepare_request(context=None, next_page_token=None)
+    second = stream._request(prepared, None)
+
+    sent = stream._requests_session.send.call_args_list[1][0][0]
+    assert sent.headers["If-None-Match"] == '"v1"'
+    assert second.status_code == 200
+    assert second.content == first.content
+
+
+def test_fresh_entries_skip_the_network(tmp_path):
+    """Test entries younger than the stream TTL are served without a request."""
+    stream = make_stream(PHPStatsStream, tmp_path)
+    stream._requests_session.send.return_value = make_response(b'{"8.2": "10"}')
+
+    for _ in range(3):
+        prepared = stream.prepare_request(context=None, next_page_token=None)
+        response = stream._request(prepared, None)
+
+    assert stream._requests_session.send.call_count == 1
+    assert list(stream.parse_response(response))[0]["version"] == "8.2"
+
+
+def test_ttl_override_from_config(tmp_path):
+    """Test per-stream TTLs can be overridden in config."""
+    stream = make_stream(PHPStatsStream, tmp_path, http_cache_ttls={"php_stats": 0})
+    assert stream.get_http_cache_ttl() == 0
+    assert make_stream(PHPStatsStream, tmp_path).get_http_cache_ttl() == 43200
+
+
+def test_cached_responses_parse_with_streaming(tmp_path):
+    """Test cache hits and revalidations are parsed from memory when streaming."""
+    body = b'{"info": {"page": 1, "pages": 1}, "plugins": [{"slug": "a"}]}'
+    stream = make_stream(PluginsStream, tmp_path, streaming_parse=True)
+    stream.get_starting_replication_key_value = Mock(return_value=None)
+    stream._requests_session.send.side_effect = [
+        make_response(body, headers={"ETag": '"v1"'}),
+        make_response(b"", status_code=304),
+    ]
+
+    for ttl in (3600, 3600, 0):
+        stream.http_cache_ttl = ttl
+        prepared = stream.prepare_request(context=None, next_page_token=None)
+        response = stream._request(prepared, None)
+        assert list(stream.parse_response(response)) == [{"slug": "a"}]
+
+    assert stream._requests_session.send.call_count == 2
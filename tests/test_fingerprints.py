@@ -0,0 +1,56 @@
+"""Test record change detection."""
+
+from unittest.mock import Mock
+
+from tap_wordpress_org.fingerprints import FingerprintIndex, fingerprint
+from tap_wordpress_org.streams import PluginsStream
+
+
+def make_stream(tmp_path, **config):
+    """Build a plugins stream with a fingerprint index."""
+    tap_mock = Mock()
+    tap_mock.config = {
+        "fingerprint_index_path": str(tmp_path / "fingerprints.sqlite"),
+        **config,
+    }
+    stream = PluginsStream(tap=tap_mock)
+    stream.get_starting_replication_key_value = Mock(return_value=None)
+    return stream
+
+
+def test_fingerprint_ignores_key_order():
+    """Test fingerprints are stable across key order."""
+    assert fingerprint({"a": 1, "b": {"c": 2}}) == fingerprint({"b": {"c": 2}, "a": 1})
+    assert fingerprint({"a": 1}) != fingerprint({"a": 2})
+
+
+def test_index_round_trip(tmp_path):
+    """Test fingerprints persist per stream."""
+    index = FingerprintIndex(str(tmp_path / "fingerprints.sqlite"))
+    index.save("plugins", {"akismet": "abc"})
+
+    assert index.load("plugins") == {"akismet": "abc"}
+    assert index.load("themes") == {}
+
+
+def test_unchanged_records_are_suppressed_across_runs(tmp_path):
+    """Test only new or changed records are emitted on the next run."""
+    rows = [
+        {"slug": "akismet", "name": "Akismet", "downloaded": 10},
+        {"slug": "jetpack", "name": "Jetpack", "downloaded": 20},
+    ]
+
+    first_run = make_stream(tmp_path)
+    emitted = [first_run.post_process(dict(row), context={}) for row in rows]
+    first_run._save_fingerprints()
+    assert all(emitted)
+
+    rows[1]["downloaded"] = 21
+    second_run = make_stream(tmp_path)
+    emitted = [second_run.post_process(dict(row), context={}) for row in rows]
+    second_run._save_fingerprints()
+    assert emitted[0] is None
+    assert emitted[1]["downloaded"] == 21
+
+    forced = make_stream(tmp_path, force_full_emission=True)
+    assert all(forced.post_process(dict(row), context={}) for row in rows)
@@ -0,0 +1,79 @@
+"""Test the per-stream timings and counters."""
+
+import json
+import logging
+from unittest.mock import patch
+
+import requests
+
+from tap_wordpress_org.instrumentation import Histogram, StreamStats, format_prometheus
+from tap_wordpress_org.tap import TapWordPressOrg
+
+
+def test_histogram_cumulative_buckets():
+    """Test observations are counted in every bucket at or above them."""
+    histogram = Histogram(buckets=(0.1, 1.0))
+    for value in (0.05, 0.1, 0.5, 3.0):
+        histogram.observe(value)
+
+    assert histogram.cumulative_counts() == [("0.1", 2), ("1.0", 3), ("+Inf", 4)]
+    assert histogram.to_dict()["count"] == 4
+    assert histogram.sum == 3.65
+
+
+def test_format_prometheus_skips_idle_streams():
+    """Test only streams that sent requests are exported."""
+    plugins = StreamStats()
+    plugins.request_latency.observe(0.2)
+    plugins.add("bytes_received", 1024)
+    plugins.add("records_dropped", 3)
+
+    text = format_prometheus({"plugins": plugins, "themes": StreamStats()})
+
+    assert (
+        'tap_wordpress_org_http_request_duration_seconds_bucket{stream="plugins",'
+        'le="0.25"} 1'
+    ) in text
+    assert 'tap_wordpress_org_http_response_bytes_total{stream="plugins"} 1024' in text
+    assert 'tap_wordpress_org_records_dropped_total{stream="plugins"} 3' in text
+    assert 'stream="themes"' not in text
+
+
+def test_sync_reports_metrics(tmp_path, caplog):
+    """Test a sync logs metric lines and writes the Prometheus textfile."""
+    textfile = tmp_path / "tap.prom"
+    tap = TapWordPressOrg(
+        config={
+            "stream_selection": ["wordpress_stats"],
+            "request_delay": 0,
+            "metrics_textfile": str(textfile),
+        }
+    )
+
+    def send(prepared_request, **kwargs):
+        response = requests.Response()
+        response.status_code = 200
+        response.url = prepared_request.url
+        response._content = b'{"6.4": 30, "6.5": 70}'
+        return response
+
+    with caplog.at_level(logging.INFO):
+        with patch.object(requests.Session, "send", side_effect=send):
+            tap.sync_all()
+
+    points = [
+        json.loads(record.getMessage().split("METRIC: ", 1)[1])
+        for record in caplog.records
+        if record.getMessage().startswith("METRIC: ")
+    ]
+    latency = next(p for p in points if p["metric"] == "http_request_latency")
+    assert latency["tags"]["stream"] == "wordpress_stats"
+    assert latency["value"]["count"] == 1
+    received = next(p for p in points if p["metric"] == "http_bytes_received")
+    assert received["value"] == 22
+    # The shared limiter's wait is only reported per stream
+    waits = [p for p in points if p["metric"] == "rate_limit_wait"]
+    assert [p["tags"]["stream"] for p in waits] == ["wordpress_stats"]
+
+    count = "tap_wordpress_org_http_request_duration_seconds_count"
+    assert f'{count}{{stream="wordpress_stats"}} 1' in textfile.read_text()
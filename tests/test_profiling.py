@@ -0,0 +1,72 @@
+"""Test the built-in sync profiler."""
+
+import json
+import pstats
+from unittest.mock import patch
+
+import requests
+
+from tap_wordpress_org.tap import TapWordPressOrg
+
+
+def _send(prepared_request, **kwargs):
+    response = requests.Response()
+    response.status_code = 200
+    response.url = prepared_request.url
+    response._content = b'{"6.4": 30, "6.5": 70}'
+    return response
+
+
+def _invoke(tmp_path, config):
+    """Run the command line sync, returning the tap it built."""
+    config_path = tmp_path / "config.json"
+    config_path.write_text(json.dumps(config))
+    with patch.object(requests.Session, "send", side_effect=_send):
+        with patch.object(
+            TapWordPressOrg,
+            "sync_streams",
+            autospec=True,
+            side_effect=TapWordPressOrg.sync_streams,
+        ) as sync_streams:
+            TapWordPressOrg.invoke(config=(str(config_path),))
+    return sync_streams.call_args[0][0]
+
+
+def test_profile_output(tmp_path, capsys):
+    """Test a profiled sync writes pstats and a per-stream summary."""
+    output = tmp_path / "sync.pstats"
+    tap = _invoke(
+        tmp_path,
+        {
+            "stream_selection": ["wordpress_stats", "php_stats"],
+            "request_delay": 0,
+            "profile_output": str(output),
+            "profile_top": 5,
+        },
+    )
+
+    assert pstats.Stats(str(output)).total_calls > 0
+    report = capsys.readouterr().err
+    assert f"Profile written to {output}" in report
+    assert "Top 5 functions by cumulative time" in report
+    rows = {line.split()[0]: line.split()[1:] for line in report.splitlines()[2:5]}
+    assert rows["stream"] == [
+        "sync",
+        "request",
+        "parse_response",
+        "post_process",
+        "get_next_page_token",
+    ]
+    # One request and two records, paginated without a page token hook
+    calls = [cell.split("/")[1] for cell in rows["php_stats"]]
+    assert calls == ["1", "1", "1", "2", "0"]
+
+    stream = tap.streams["php_stats"]
+    assert "post_process" not in stream.__dict__
+
+
+def test_no_profile_by_default(tmp_path, capsys):
+    """Test nothing is profiled unless profile_output is set."""
+    _invoke(tmp_path, {"stream_selection": ["php_stats"], "request_delay": 0})
+
+    assert "Profile written" not in capsys.readouterr().err
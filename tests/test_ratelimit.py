@@ -0,0 +1,94 @@
+"""Test the adaptive rate limiter."""
+
+import time
+from unittest.mock import Mock
+
+import pytest
+from singer_sdk.exceptions import RetriableAPIError
+
+from tap_wordpress_org.ratelimit import TokenBucketRateLimiter, parse_retry_after
+from tap_wordpress_org.streams import PluginsStream
+
+
+def test_from_config_derives_rate_from_request_delay():
+    """Test the legacy request_delay maps onto requests_per_second."""
+    assert TokenBucketRateLimiter.from_config({}).max_rate == 10
+    assert TokenBucketRateLimiter.from_config({"request_delay": 0.5}).max_rate == 2
+    assert not TokenBucketRateLimiter.from_config({"request_delay": 0}).enabled
+
+    limiter = TokenBucketRateLimiter.from_config(
+        {"request_delay": 0.5, "requests_per_second": 20, "burst_size": 5}
+    )
+    assert limiter.max_rate == 20
+    assert limiter.burst_size == 5
+
+
+def test_burst_then_rate():
+    """Test a full bucket allows a burst before waiting for tokens."""
+    limiter = TokenBucketRateLimiter(requests_per_second=20, burst_size=3)
+
+    start = time.monotonic()
+    for _ in range(3):
+        assert limiter.acquire() == 0.0
+    assert limiter.acquire() > 0
+    assert time.monotonic() - start >= 0.04
+
+
+def test_throttling_backs_off_and_recovers():
+    """Test the rate halves on throttling and ramps back after successes."""
+    limiter = TokenBucketRateLimiter(requests_per_second=8, recovery_after=2)
+
+    limiter.record_response(429)
+    assert limiter.rate == 4
+    limiter.record_response(503)
+    assert limiter.rate == 2
+
+    for _ in range(10):
+        limiter.record_response(200)
+    assert limiter.rate == 8
+
+
+def test_retry_after_blocks_requests():
+    """Test a Retry-After delay is honoured before the next request."""
+    limiter = TokenBucketRateLimiter(requests_per_second=100, burst_size=10)
+    limiter.record_response(429, retry_after=0.1)
+
+    assert limiter.acquire() >= 0.09
+    assert limiter.total_wait >= 0.09
+
+
+@pytest.mark.parametrize(
+    "value, expected",
+    [(None, None), ("", None), ("3", 3.0), ("-1", 0.0), ("soon", None)],
+)
+def test_parse_retry_after(value, expected):
+    """Test Retry-After parsing for seconds and invalid values."""
+    assert parse_retry_after(value) == expected
+
+
+def test_parse_retry_after_http_date():
+    """Test Retry-After parsing for HTTP dates."""
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
+
+
+def test_stream_reports_responses_to_limiter():
+    """Test validate_response feeds throttling signals to the limiter."""
+    tap_mock = Mock()
+    tap_mock.config = {}
+    stream = PluginsStream(tap=tap_mock)
+    stream.rate_limiter = TokenBucketRateLimiter(requests_per_second=10)
+
+    response = Mock(status_code=200, headers={})
+    stream.validate_response(response)
+    assert stream.rate_limiter.rate == 10
+
+    response = Mock(
+        status_code=429,
+        headers={"Retry-After": "0"},
+        url="https://api.wordpress.org/plugins/info/1.2/",
+        reason="Too Many Requests",
+        content=b"",
+    )
+    with pytest.raises(RetriableAPIError):
+        stream.validate_response(response)
+    assert stream.rate_limiter.rate == 5
@@ -0,0 +1,179 @@
+"""Test recording API responses and replaying them offline."""
+
+import gzip
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import Mock
+
+import pytest
+
+from tap_wordpress_org.replay import load_archive, request_key
+from tap_wordpress_org.session import create_session
+from tap_wordpress_org.streams import PluginsStream
+from tap_wordpress_org.tap import TapWordPressOrg
+
+STATS = {"6.4": 30, "6.5": 70}
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    paths: list = []
+
+    def do_GET(self):
+        self.paths.append(self.path)
+        body = json.dumps(STATS if "stats" in self.path else {"path": self.path})
+        body_bytes = body.encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body_bytes)))
+        self.send_header("X-WP-Total", "2")
+        self.end_headers()
+        self.wfile.write(body_bytes)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server_url():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}"
+    server.shutdown()
+    server.server_close()
+
+
+def write_archive(path, entries):
+    with gzip.open(path, "wt", encoding="utf-8") as archive:
+        for entry in entries:
+            archive.write(json.dumps(entry) + "\n")
+
+
+def test_request_key_ignores_query_order():
+    """Test requests differing only in query order share an archive key."""
+    assert request_key("get", "https://a.org/x?b=2&a=1") == request_key(
+        "GET", "https://a.org/x?a=1&b=2"
+    )
+    assert request_key("GET", "https://a.org/x?a=1") != request_key(
+        "GET", "https://a.org/x?a=2"
+    )
+
+
+def test_record_then_replay(server_url, tmp_path):
+    """Test recorded responses are replayed with their status and headers."""
+    archive = str(tmp_path / "responses.jsonl.gz")
+    session = create_session({"http_archive": archive, "http_archive_mode": "record"})
+    recorded = session.get(f"{server_url}/info/?page=2&per_page=10")
+    session.close()
+
+    assert list(load_archive(archive)) == [
+        request_key("GET", f"{server_url}/info/?page=2&per_page=10")
+    ]
+
+    session = create_session({"http_archive": archive})
+    replayed = session.get(f"{server_url}/info/?per_page=10&page=2")
+    assert replayed.status_code == 200
+    assert replayed.json() == recorded.json()
+    assert replayed.headers["X-WP-Total"] == "2"
+    assert "Content-Length" not in replayed.headers
+
+
+def test_discovery_leaves_archive_untouched(tmp_path):
+    """Test building the tap in record mode does not truncate the archive."""
+    archive = tmp_path / "responses.jsonl.gz"
+    key = request_key("GET", "https://api.wordpress.org/x")
+    write_archive(str(archive), [{"key": key, "status": 200, "headers": {}}])
+    recorded = archive.read_bytes()
+
+    tap = TapWordPressOrg(
+        config={"http_archive": str(archive), "http_archive_mode": "record"}
+    )
+    assert tap.catalog_dict["streams"]
+    tap.http_session.close()
+
+    assert archive.read_bytes() == recorded
+    assert list(load_archive(str(archive))) == [key]
+
+
+def test_replay_serves_repeated_responses_in_order(tmp_path):
+    """Test repeated requests get their responses in recorded order."""
+    archive = str(tmp_path / "responses.jsonl.gz")
+    key = request_key("GET", "https://api.wordpress.org/x")
+    write_archive(
+        archive,
+        [
+            {"key": key, "status": 503, "headers": {}, "body": ""},
+            {"key": key, "status": 200, "headers": {}, "body": "{}"},
+        ],
+    )
+    session = create_session({"http_archive": archive})
+
+    statuses = [session.get("https://api.wordpress.org/x").status_code for _ in "abc"]
+    assert statuses == [503, 200, 200]
+    assert session.get("https://api.wordpress.org/missing").status_code == 404
+
+
+def test_replayed_responses_parse_with_streaming(tmp_path):
+    """Test replayed bodies are parsed from memory when streaming is enabled."""
+    archive = str(tmp_path / "responses.jsonl.gz")
+    config = {"request_delay": 0, "streaming_parse": True, "http_archive": archive}
+    stream = PluginsStream(tap=Mock(config=config))
+    stream.get_starting_replication_key_value = Mock(return_value=None)
+    prepared = stream.prepare_request(context=None, next_page_token=None)
+    body = {"info": {"page": 1, "pages": 1}, "plugins": [{"slug": "a"}]}
+    write_archive(
+        archive,
+        [
+            {
+                "key": request_key("GET", prepared.url),
+                "status": 200,
+                "headers": {},
+                "body": json.dumps(body),
+            }
+        ],
+    )
+    stream.requests_session = create_session(config)
+
+    response = stream._request(prepared, None)
+    assert list(stream.parse_response(response)) == [{"slug": "a"}]
+
+
+def test_replay_latency(tmp_path):
+    """Test replayed responses are delayed by the configured latency."""
+    archive = str(tmp_path / "responses.jsonl.gz")
+    key = request_key("GET", "https://api.wordpress.org/x")
+    write_archive(archive, [{"key": key, "status": 200, "headers": {}, "body": ""}])
+    session = create_session({"http_archive": archive, "replay_latency": 0.05})
+
+    start = time.monotonic()
+    session.get("https://api.wordpress.org/x")
+    assert time.monotonic() - start >= 0.05
+
+
+def _sync_records(config, capsys):
+    TapWordPressOrg(config=config).sync_all()
+    messages = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    return [m["record"] for m in messages if m["type"] == "RECORD"]
+
+
+def test_tap_replays_recorded_sync(server_url, tmp_path, capsys):
+    """Test a sync replayed from an archive matches the recorded sync."""
+    archive = str(tmp_path / "responses.jsonl.gz")
+    config = {
+        "api_url": server_url,
+        "stream_selection": ["wordpress_stats"],
+        "request_delay": 0,
+        "http_archive": archive,
+    }
+
+    _Handler.paths.clear()
+    recorded = _sync_records({**config, "http_archive_mode": "record"}, capsys)
+    assert len(_Handler.paths) == 1
+
+    replayed = _sync_records(config, capsys)
+    assert len(_Handler.paths) == 1
+    assert [record["version"] for record in recorded] == ["6.4", "6.5"]
+    assert replayed == recorded
@@ -0,0 +1,69 @@
+"""Test the pooled HTTP session shared by the streams."""
+
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+import pytest
+
+from tap_wordpress_org.session import create_session, get_pool_stats
+from tap_wordpress_org.tap import TapWordPressOrg
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        body = b"{}"
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server_url():
+    server = HTTPServer(("127.0.0.1", 0), _Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}"
+    server.shutdown()
+    server.server_close()
+
+
+def test_pool_size_follows_concurrency():
+    """Test the pool keeps a connection open for every concurrent request."""
+    session = create_session({"max_concurrency": 32})
+    assert session.get_adapter("https://api.wordpress.org")._pool_maxsize == 32
+
+    session = create_session({"http_pool_maxsize": 4, "max_concurrency": 32})
+    assert session.get_adapter("https://api.wordpress.org")._pool_maxsize == 4
+
+
+def test_pool_stats_count_reused_connections(server_url):
+    """Test keep-alive requests reuse a single connection."""
+    session = create_session({})
+    for _ in range(3):
+        session.get(server_url).raise_for_status()
+
+    assert get_pool_stats(session) == {
+        "requests": 3,
+        "new_connections": 1,
+        "reused_connections": 2,
+    }
+
+
+def test_keep_alive_can_be_disabled():
+    """Test connections are closed after each request without keep-alive."""
+    session = create_session({"http_keep_alive": False})
+    assert session.headers["Connection"] == "close"
+
+
+def test_streams_share_session():
+    """Test every stream sends its requests through the tap's session."""
+    tap = TapWordPressOrg(config={})
+    sessions = {id(stream.requests_session) for stream in tap.streams.values()}
+    assert sessions == {id(tap.http_session)}
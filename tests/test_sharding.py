@@ -0,0 +1,61 @@
+"""Test merging the state of sharded workers."""
+
+import json
+
+from tap_wordpress_org.sharding import main, merge_states
+
+
+def _state(shard, value):
+    return {
+        "bookmarks": {
+            "plugins": {
+                "partitions": [
+                    {
+                        "context": {"shard": shard, "shard_count": 2},
+                        "replication_key": "last_updated",
+                        "replication_key_value": value,
+                    }
+                ]
+            }
+        }
+    }
+
+
+def test_merge_states_combines_shard_partitions():
+    """Test each shard's partition is kept in the merged state."""
+    merged = merge_states(
+        [
+            _state(0, "2024-06-02 12:00pm GMT"),
+            _state(1, "2024-06-01 9:00am GMT"),
+        ]
+    )
+
+    partitions = merged["bookmarks"]["plugins"]["partitions"]
+    assert [p["context"]["shard"] for p in partitions] == [0, 1]
+
+
+def test_merge_states_keeps_most_advanced_bookmark():
+    """Test duplicate partitions keep the newest bookmark, compared as times."""
+    merged = merge_states(
+        [
+            _state(0, "2024-06-02 12:00pm GMT"),
+            _state(0, "2024-06-02 9:00am GMT"),
+        ]
+    )
+
+    (partition,) = merged["bookmarks"]["plugins"]["partitions"]
+    assert partition["replication_key_value"] == "2024-06-02 12:00pm GMT"
+
+
+def test_merge_states_cli(tmp_path, capsys):
+    """Test the command line entry point prints the merged state."""
+    paths = []
+    for shard in (0, 1):
+        path = tmp_path / f"state-{shard}.json"
+        path.write_text(json.dumps(_state(shard, "2024-06-01 9:00am GMT")))
+        paths.append(str(path))
+
+    main(paths)
+
+    merged = json.loads(capsys.readouterr().out)
+    assert len(merged["bookmarks"]["plugins"]["partitions"]) == 2
@@ -1,21 +1,45 @@
 """Test stream functionality."""
 
-from unittest.mock import Mock
+import io
+import json
+import time
+from datetime import datetime, timezone
+from unittest.mock import Mock, patch
+from urllib.parse import parse_qs, urlparse
 
 import pytest
+import requests
 
+from tap_wordpress_org.client import get_json_backend
 from tap_wordpress_org.streams import (
     EventsStream,
     LocaleStatsStream,
     MySQLStatsStream,
     PatternsStream,
     PHPStatsStream,
+    PluginDownloadsStream,
     PluginsStream,
     ThemesStream,
     WordPressStatsStream,
 )
 
 
+def make_response(payload, status_code=200):
+    """Build a requests.Response carrying a JSON payload."""
+    response = requests.Response()
+    response.status_code = status_code
+    response._content = json.dumps(payload).encode()
+    return response
+
+
+def make_streamed_response(payload, status_code=200):
+    """Build a requests.Response whose body has not been read yet."""
+    response = requests.Response()
+    response.status_code = status_code
+    response.raw = io.BytesIO(json.dumps(payload).encode())
+    return response
+
+
 class TestStreams:
     """Test stream classes."""
 
@@ -122,7 +146,7 @@ class TestStreams:
 
         assert stream.name == "wordpress_stats"
         assert stream.path == "/stats/wordpress/1.0/"
-        assert stream.primary_keys == ["version"]
+        assert stream.primary_keys == ["group", "version"]
         assert stream.records_jsonpath == "$[*]"
 
     def test_php_stats_stream_properties(self):
@@ -133,7 +157,7 @@ class TestStreams:
 
         assert stream.name == "php_stats"
         assert stream.path == "/stats/php/1.0/"
-        assert stream.primary_keys == ["version"]
+        assert stream.primary_keys == ["group", "version"]
         assert stream.records_jsonpath == "$[*]"
 
     def test_mysql_stats_stream_properties(self):
@@ -144,7 +168,7 @@ class TestStreams:
 
         assert stream.name == "mysql_stats"
         assert stream.path == "/stats/mysql/1.0/"
-        assert stream.primary_keys == ["version"]
+        assert stream.primary_keys == ["group", "version"]
         assert stream.records_jsonpath == "$[*]"
 
     def test_locale_stats_stream_properties(self):
@@ -155,7 +179,7 @@ class TestStreams:
 
         assert stream.name == "locale_stats"
         assert stream.path == "/stats/locale/1.0/"
-        assert stream.primary_keys == ["locale"]
+        assert stream.primary_keys == ["group", "locale"]
         assert stream.records_jsonpath == "$[*]"
 
     def test_stats_parse_response(self):
@@ -165,14 +189,15 @@ class TestStreams:
         stream = WordPressStatsStream(tap=tap_mock)
 
         # Mock response with sample data
-        mock_response = Mock()
-        mock_response.json.return_value = {
-            "6.4": "12345",
-            "6.3": "54321",
-            "6.2": "9876",
-        }
+        mock_response = make_response(
+            {
+                "6.4": "12345",
+                "6.3": "54321",
+                "6.2": "9876",
+            }
+        )
 
-        records = stream.parse_response(mock_response)
+        records = list(stream.parse_response(mock_response))
 
         assert len(records) == 3
         assert records[0]["version"] == "6.4"
@@ -183,6 +208,38 @@ class TestStreams:
         total_percent = sum(record["percent"] for record in records)
         assert abs(total_percent - 100.0) < 0.01  # Allow for floating point precision
 
+    def test_stats_parse_response_nested_map(self):
+        """Test stats parsing flattens nested maps and totals them once."""
+        tap_mock = Mock()
+        tap_mock.config = self.config
+        stream = LocaleStatsStream(tap=tap_mock)
+
+        mock_response = make_response(
+            {"en": {"en_US": "40", "other": "20"}, "de": {"other": "20"}, "fr": "20"}
+        )
+
+        records = list(stream.parse_response(mock_response))
+
+        # Equal keys in different groups stay distinct records
+        assert records == [
+            {"group": "en", "locale": "en_US", "count": 40, "percent": 40.0},
+            {"group": "en", "locale": "other", "count": 20, "percent": 20.0},
+            {"group": "de", "locale": "other", "count": 20, "percent": 20.0},
+            {"group": "", "locale": "fr", "count": 20, "percent": 20.0},
+        ]
+        keys = {tuple(row[key] for key in stream.primary_keys) for row in records}
+        assert len(keys) == len(records)
+
+    def test_stats_parse_response_empty(self):
+        """Test stats parsing handles empty and all-zero payloads."""
+        tap_mock = Mock()
+        tap_mock.config = self.config
+        stream = PHPStatsStream(tap=tap_mock)
+
+        assert list(stream.parse_response(make_response({}))) == []
+        records = list(stream.parse_response(make_response({"8.2": "0"})))
+        assert records == [{"group": "", "version": "8.2", "count": 0, "percent": 0}]
+
     def test_all_stats_stream_schemas(self):
         """Test that all stats streams have required schema fields."""
         tap_mock = Mock()
@@ -317,6 +374,724 @@ class TestStreams:
         record = {"id": "test", "title": "Test"}
         assert events._filter_by_replication_key(record, context={}) == record
 
+    def test_concurrent_pagination_preserves_page_order(self):
+        """Test concurrent page fetching emits records in page order."""
+        tap_mock = Mock()
+        tap_mock.config = {**self.config, "max_concurrency": 4}
+        tap_mock.state = {}
+        stream = PluginsStream(tap=tap_mock)
+        stream.get_starting_replication_key_value = Mock(return_value=None)
+
+        def fake_request(prepared_request, context):
+            query = parse_qs(urlparse(prepared_request.url).query)
+            page = int(query.get("page", ["1"])[0])
+            # Later pages answer first to shuffle completion order
+            time.sleep((6 - page) * 0.01)
+            return make_response(
+                {
+                    "info": {"page": page, "pages": 5},
+                    "plugins": [{"slug": f"plugin-{page}-{i}"} for i in range(2)],
+                }
+            )
+
+        stream._request = fake_request
+        records = list(stream.request_records(context=None))
+
+        assert [r["slug"] for r in records] == [
+            f"plugin-{page}-{i}" for page in range(1, 6) for i in range(2)
+        ]
+
+    def test_response_body_decoded_once(self):
+        """Test parsing and pagination share one decoded payload."""
+        tap_mock = Mock()
+        tap_mock.config = self.config
+        stream = PluginsStream(tap=tap_mock)
+        stream.get_starting_replication_key_value = Mock(return_value=None)
+
+        mock_response = make_response(
+            {
+                "info": {"page": 1, "pages": 3},
+                "plugins": [{"slug": "test-plugin"}],
+            }
+        )
+
+        backend = stream.json_backend
+        with patch.object(backend, "loads", wraps=backend.loads) as loads:
+            records = list(stream.parse_response(mock_response))
+            next_page = stream.get_next_page_token(mock_response, None)
+
+        assert records == [{"slug": "test-plugin"}]
+        assert next_page == 2
+        loads.assert_called_once()
+
+    @pytest.mark.parametrize("backend_name", ["auto", "orjson", "msgspec", "json"])
+    def test_json_backends_decode_and_encode(self, backend_name):
+        """Test every JSON backend round-trips a payload or falls back."""
+        backend = get_json_backend(backend_name)
+        payload = {"slug": "test", "rating": 4.5, "versions": {"1.0": "url"}}
+
+        assert backend.loads(json.dumps(payload).encode()) == payload
+        assert json.loads(backend.dumps(payload)) == payload
+
+    def test_unknown_json_backend(self):
+        """Test an unknown JSON backend name is rejected."""
+        with pytest.raises(ValueError):
+            get_json_backend("yaml")
+
+    def test_incremental_filtering_compares_parsed_timestamps(self):
+        """Test plugin timestamps are compared as times, not strings."""
+        tap_mock = Mock()
+        tap_mock.config = self.config
+        stream = PluginsStream(tap=tap_mock)
+        stream.get_starting_replication_key_value = Mock(
+            return_value="2024-06-01 9:00am GMT"
+        )
+
+        # "10:00am" sorts before "9:00am" as a string but is newer
+        newer = {"slug": "newer", "last_updated": "2024-06-01 10:00am GMT"}
+        older = {"slug": "older", "last_updated": "2024-06-01 8:15am GMT"}
+
+        assert stream._filter_by_replication_key(newer, context={}) == newer
+        assert stream._stop_pagination is False
+        assert stream._filter_by_replication_key(older, context={}) is None
+        assert stream._stop_pagination is True
+
+    def test_bookmark_resolved_once_per_partition(self):
+        """Test the starting bookmark is read from state once per partition."""
+        tap_mock = Mock()
+        tap_mock.config = self.config
+        stream = ThemesStream(tap=tap_mock)
+        stream.get_starting_replication_key_value = Mock(
+            return_value="2024-06-01 12:00:00"
+        )
+
+        for day in range(10, 20):
+            row = {"slug": "test", "last_updated_time": f"2024-06-{day} 10:00:00"}
+            stream._filter_by_replication_key(row, context={"shard": 0})
+        stream._filter_by_replication_key(row, context={"shard": 1})
+
+        assert stream.get_starting_replication_key_value.call_count == 2
+
+    def test_page_level_bookmark_short_circuit(self):
+        """Test whole pages are accepted or dropped against the bookmark."""
+        tap_mock = Mock()
+        tap_mock.config = self.config
+        stream = PluginsStream(tap=tap_mock)
+        stream.get_starting_replication_key_value = Mock(
+            return_value="2024-06-02 12:00pm GMT"
+        )
+
+        def page(*days):
+            return make_response(
+                {
+                    "info": {"page": 1, "pages": 3},
+                    "plugins": [
+                        {"slug": f"p{day}", "last_updated": f"2024-06-{day} 1:00pm GMT"}
+                        for day in days
+                    ],
+                }
+            )
+
+        # Whole page newer: emitted without per-row comparisons
+        stream._is_older_than_bookmark = Mock(wraps=stream._is_older_than_bookmark)
+        records = [
+            stream.post_process(row, context={})
+            for row in stream.parse_response(page("09", "05", "02"))
+        ]
+        assert [r["slug"] for r in records] == ["p09", "p05", "p02"]
+        assert stream._is_older_than_bookmark.call_count == 2
+
+        # Page straddling the bookmark: filtered row by row
+        records = [
+            stream.post_process(row, context={})
+            for row in stream.parse_response(page("03", "01", "01"))
+        ]
+        assert [r and r["slug"] for r in records] == ["p03", None, None]
+        assert stream._stop_pagination is True
+
+        # Page entirely older: dropped before post-processing
+        stream._stop_pagination = False
+        assert list(stream.parse_response(page("01", "01"))) == []
+        assert stream._stop_pagination is True
+
+    def test_page_level_bookmark_ignores_zero_dates(self):
+        """Test a zero-dated first record does not drop a newer page."""
+        tap_mock = Mock()
+        tap_mock.config = self.config
+        stream = PluginsStream(tap=tap_mock)
+        stream.get_starting_replication_key_value = Mock(
+            return_value="2024-01-01 3:45pm GMT"
+        )
+        dates = [
+            "0000-00-00 00:00:00",
+            "2024-06-01 1:00pm GMT",
+            "2024-05-01 1:00pm GMT",
+        ]
+        response = make_response(
+            {
+                "info": {"page": 1, "pages": 3},
+                "plugins": [
+                    {"slug": f"p{i}", "last_updated": date}
+                    for i, date in enumerate(dates)
+                ],
+            }
+        )
+
+        records = [
+            stream.post_process(row, context={})
+            for row in stream.parse_response(response)
+        ]
+        assert [r and r["slug"] for r in records] == ["p0", "p1", "p2"]
+        assert records[0]["last_updated"] is None
+        assert stream._stop_pagination is False
+
+        # An older page still stops pagination, keeping its undated records
+        response = make_response(
+            {
+                "info": {"page": 2, "pages": 3},
+                "plugins": [
+                    {"slug": "p3", "last_updated": "0000-00-00 00:00:00"},
+                    {"slug": "p4", "last_updated": "2023-12-01 1:00pm GMT"},
+                ],
+            }
+        )
+        assert [r["slug"] for r in stream.parse_response(response)] == ["p3"]
+        assert stream._stop_pagination is True
+
+    @pytest.mark.parametrize("info_first", [True, False])
+    def test_streaming_parse_matches_buffered_parse(self, info_first):
+        """Test streamed records and pagination match the buffered parser."""
+        pytest.importorskip("ijson")
+        tap_mock = Mock()
+        tap_mock.config = {**self.config, "streaming_parse": True}
+        stream = PluginsStream(tap=tap_mock)
+        stream.get_starting_replication_key_value = Mock(return_value=None)
+        assert stream.streaming_parse
+
+        plugins = [
+            {"slug": f"plugin-{i}", "rating": 4.5, "tags": {"a": "A"}, "v": [1, [2]]}
+            for i in range(3)
+        ]
+        info = {"page": 2, "pages": 4}
+        payload = {"info": info, "plugins": plugins}
+        if not info_first:
+            payload = {"plugins": plugins, "info": info}
+
+        response = make_streamed_response(payload)
+        assert list(stream.parse_response(response)) == plugins
+        assert stream.get_next_page_token(response, None) == 3
+        # The body is counted as it is read, without a Content-Length header
+        assert stream.instrumentation.bytes_received == len(json.dumps(payload))
+        assert stream.instrumentation.decode_seconds > 0
+
+    def test_streaming_parse_disabled_for_non_array_paths(self):
+        """Test streaming only applies to top-level array record paths."""
+        tap_mock = Mock()
+        tap_mock.config = {**self.config, "streaming_parse": True}
+
+        assert not WordPressStatsStream(tap=tap_mock).streaming_parse
+        assert not PluginsStream(tap=Mock(config=self.config)).streaming_parse
+
+    def test_page_size_config(self):
+        """Test the page size is configurable for plugins and themes."""
+        tap_mock = Mock()
+        tap_mock.config = {**self.config, "page_size": 250}
+
+        plugins = PluginsStream(tap=tap_mock).get_url_params({}, None)
+        themes = ThemesStream(tap=tap_mock).get_url_params({}, None)
+        assert plugins["per_page"] == 250
+        assert themes["request[per_page]"] == 250
+
+    def test_sharded_pagination(self):
+        """Test each shard requests a disjoint set of pages."""
+        tap_mock = Mock()
+        tap_mock.config = {**self.config, "shard_count": 3, "shard_index": 1}
+        stream = PluginsStream(tap=tap_mock)
+
+        assert stream.partitions == [{"shard": 1, "shard_count": 3}]
+        context = stream.partitions[0]
+        stream._partition_context = context
+        assert stream.get_url_params(context, None)["page"] == 2
+
+        response = make_response({"info": {"page": 2, "pages": 10}, "plugins": []})
+        assert stream.get_next_page_token(response, None) == 5
+        assert stream.get_page_tokens(response) == [5, 8]
+
+        last = make_response({"info": {"page": 8, "pages": 10}, "plugins": []})
+        assert stream.get_next_page_token(last, 8) is None
+
+    def test_shard_index_out_of_range(self):
+        """Test an invalid shard index is rejected."""
+        tap_mock = Mock()
+        tap_mock.config = {**self.config, "shard_count": 2, "shard_index": 2}
+
+        with pytest.raises(ValueError, match="shard_index"):
+            ThemesStream(tap=tap_mock).partitions
+
+    def test_patterns_pagination_uses_total_header(self):
+        """Test patterns stop at the reported total without an empty request."""
+        tap_mock = Mock()
+        tap_mock.config = self.config
+        stream = PatternsStream(tap=tap_mock)
+
+        response = make_response({"patterns": [{"id": i} for i in range(100)]})
+        response.headers["X-WP-Total"] = "300"
+        assert stream.get_page_tokens(response) == [100, 200]
+        assert stream.get_next_page_token(response, 100) == 200
+        assert stream.get_next_page_token(response, 200) is None
+
+    def test_patterns_pagination_without_total_header(self):
+        """Test patterns fall back to following full pages one by one."""
+        tap_mock = Mock()
+        tap_mock.config = self.config
+        stream = PatternsStream(tap=tap_mock)
+
+        full = make_response({"patterns": [{"id": i} for i in range(100)]})
+        short = make_response({"patterns": [{"id": 1}]})
+        assert stream.get_page_tokens(full) is None
+        assert stream.get_next_page_token(full, None) == 100
+        assert stream.get_next_page_token(short, 100) is None
+
+    @pytest.mark.parametrize("with_total", [True, False])
+    def test_patterns_concurrent_offsets(self, with_total):
+        """Test pattern offsets are fetched concurrently once the total is known."""
+        tap_mock = Mock()
+        tap_mock.config = {**self.config, "max_concurrency": 3}
+        tap_mock.state = {}
+        stream = PatternsStream(tap=tap_mock)
+        stream._rate_limiter = Mock(acquire=Mock(return_value=0.0))
+        requested = []
+
+        def send(prepared_request, context, stream=False):
+            offset = int(
+                parse_qs(urlparse(prepared_request.url).query).get("offset", ["0"])[0]
+            )
+            requested.append(offset)
+            count = min(100, 250 - offset)
+            response = make_response(
+                {"patterns": [{"id": offset + i} for i in range(count)]}
+            )
+            if with_total:
+                response.headers["X-WP-Total"] = "250"
+            return response
+
+        with patch.object(stream, "_send", side_effect=send):
+            records = list(stream.request_records(None))
+
+        assert [record["id"] for record in records] == list(range(250))
+        assert sorted(requested) == [0, 100, 200]
+
+    def test_events_locations_prefetched_and_deduplicated(self):
+        """Test every location is fetched up front and shared events emitted once."""
+        tap_mock = Mock()
+        tap_mock.config = {
+            **self.config,
+            "events_locations": ["Seattle", "Portland", "Seattle"],
+            "max_concurrency": 2,
+        }
+        stream = EventsStream(tap=tap_mock)
+        stream._rate_limiter = Mock(acquire=Mock(return_value=0.0))
+        requested = []
+
+        def send(prepared_request, context, stream=False):
+            location = parse_qs(urlparse(prepared_request.url).query)["location"][0]
+            requested.append(location)
+            return make_response(
+                {
+                    "events": [
+                        {"title": location, "url": f"https://example.com/{location}"},
+                        {"title": "Online", "url": "https://example.com/online"},
+                    ]
+                }
+            )
+
+        assert stream.partitions == [{"location": "Seattle"}, {"location": "Portland"}]
+        with patch.object(stream, "_send", side_effect=send):
+            records = [
+                stream.post_process(row, context)
+                for context in stream.partitions
+                for row in stream.get_records(context)
+            ]
+            # Both locations were requested before the first one was parsed
+            assert sorted(requested) == ["Portland", "Seattle"]
+
+        assert [record["title"] for record in records if record] == [
+            "Seattle",
+            "Online",
+            "Portland",
+        ]
+
+    def test_plugin_downloads_records_and_limit(self):
+        """Test download history is parsed and only recent days are requested."""
+        tap_mock = Mock()
+        tap_mock.config = self.config
+        stream = PluginDownloadsStream(tap=tap_mock)
+        stream.get_starting_replication_key_value = Mock(return_value="2024-06-01")
+        context = {"slug": "akismet"}
+
+        with patch(
+            "tap_wordpress_org.streams.datetime",
+            Mock(now=Mock(return_value=datetime(2024, 6, 11, tzinfo=timezone.utc))),
+        ):
+            params = stream.get_url_params(context, None)
+        assert params == {"slug": "akismet", "limit": 11}
+
+        stream._partition_context = context
+        response = make_response(
+            {"2024-05-31": "9", "2024-06-01": "12", "2024-06-02": "15"}
+        )
+        records = [
+            stream.post_process(row, context) for row in stream.parse_response(response)
+        ]
+        # The bookmark day is emitted again with its final count
+        assert records == [
+            None,
+            {"slug": "akismet", "date": "2024-06-01", "downloads": 12},
+            {"slug": "akismet", "date": "2024-06-02", "downloads": 15},
+        ]
+        assert list(stream.parse_response(make_response([]))) == []
+
+    def test_plugin_downloads_changed_only(self):
+        """Test only plugins whose parent values changed are refreshed."""
+        tap_mock = Mock()
+        tap_mock.config = {**self.config, "plugin_downloads_changed_only": True}
+        stream = PluginDownloadsStream(tap=tap_mock)
+        state = {"parent_signature": "2024-06-01 1:00pm GMT|100"}
+        stream.get_context_state = Mock(return_value=state)
+
+        context = {
+            "slug": "akismet",
+            "last_updated": "2024-06-01 1:00pm GMT",
+            "downloaded": 100,
+        }
+        assert not stream.needs_refresh(context)
+        assert stream.needs_refresh({**context, "downloaded": 101})
+
+        stream = PluginDownloadsStream(tap=Mock(config=self.config))
+        assert stream.needs_refresh(context)
+
+    def _crawl_plugins(self, listing, state, fail_at_page=None):
+        """Crawl a plugin listing two records per page, returning slugs and pages."""
+        tap_mock = Mock()
+        tap_mock.config = {
+            **self.config,
+            "page_size": 2,
+            "pagination_checkpoint_pages": 2,
+        }
+        tap_mock.state = state
+        stream = PluginsStream(tap=tap_mock)
+        stream.get_starting_replication_key_value = Mock(return_value=None)
+        requested, slugs = [], []
+
+        def fake_request(prepared_request, context):
+            query = parse_qs(urlparse(prepared_request.url).query)
+            page = int(query.get("page", ["1"])[0])
+            requested.append(page)
+            if page == fail_at_page:
+                raise KeyboardInterrupt
+            return make_response(
+                {
+                    "info": {"page": page, "pages": (len(listing) + 1) // 2},
+                    "plugins": listing[(page - 1) * 2 : page * 2],
+                }
+            )
+
+        stream._request = fake_request
+        # Mirror the SDK's state handling around get_records
+        stream.reset_state_progress_markers()
+        try:
+            for record in stream.get_records(None):
+                slugs.append(record["slug"])
+                stream._increment_stream_state(record, context=None)
+        except KeyboardInterrupt:
+            pass
+        else:
+            stream.finalize_state_progress_markers()
+        return slugs, requested
+
+    @staticmethod
+    def _plugin_listing(count, first_day=28):
+        """Return plugins sorted newest first, as with browse=updated."""
+        return [
+            {"slug": f"p{i}", "last_updated": f"2024-06-{first_day - i:02d} 12:00:00"}
+            for i in range(count)
+        ]
+
+    def test_interrupted_crawl_resumes_from_cursor(self):
+        """Test a crawl checkpoints its position and resumes from it."""
+        listing = self._plugin_listing(10)
+        state: dict = {}
+
+        slugs, _ = self._crawl_plugins(listing, state, fail_at_page=4)
+        assert slugs == ["p0", "p1", "p2", "p3", "p4", "p5"]
+        cursor = state["bookmarks"]["plugins"]["pagination_cursor"]
+        assert cursor["browse"] == "updated"
+        assert cursor["page"] == 3
+        assert cursor["anchor_key"] == "p3"
+        assert cursor["anchor_value"] == "2024-06-25 12:00:00"
+        assert cursor["crawl_started_at"]
+        assert cursor["high_water_mark"] == "2024-06-28T12:00:00+00:00"
+
+        # The boundary page before the checkpoint is read again
+        slugs, requested = self._crawl_plugins(listing, state)
+        assert requested == [2, 3, 4, 5]
+        assert slugs == ["p4", "p5", "p6", "p7", "p8", "p9"]
+        # The crawl completed, so the next one starts from the first page
+        bookmark = state["bookmarks"]["plugins"]
+        assert "pagination_cursor" not in bookmark
+        # The bookmark covers the pages synced before the interruption
+        assert bookmark["replication_key_value"] == "2024-06-28T12:00:00+00:00"
+
+    def test_resumed_crawl_bookmark_capped_at_crawl_start(self):
+        """Test records updated after the crawl started are left to the next run."""
+        listing = self._plugin_listing(10)
+        state: dict = {}
+        self._crawl_plugins(listing, state, fail_at_page=4)
+        cursor = state["bookmarks"]["plugins"]["pagination_cursor"]
+        cursor["crawl_started_at"] = "2024-06-26T00:00:00+00:00"
+
+        self._crawl_plugins(listing, state)
+        bookmark = state["bookmarks"]["plugins"]
+        assert bookmark["replication_key_value"] == "2024-06-26T00:00:00+00:00"
+
+    def test_resumed_crawl_keeps_records_shifted_up(self):
+        """Test records moved across the boundary by removals are still synced."""
+        listing = self._plugin_listing(10)
+        state: dict = {}
+        self._crawl_plugins(listing, state, fail_at_page=4)
+
+        removed = [plugin for plugin in listing if plugin["slug"] != "p1"]
+        slugs, requested = self._crawl_plugins(removed, state)
+        assert requested == [2, 3, 4, 5]
+        assert slugs == ["p4", "p5", "p6", "p7", "p8", "p9"]
+
+    def test_resumed_crawl_skips_records_shifted_down(self):
+        """Test records pushed onto the resumed page by new updates are skipped."""
+        listing = self._plugin_listing(10)
+        state: dict = {}
+        self._crawl_plugins(listing, state, fail_at_page=4)
+
+        updated = [{"slug": "new", "last_updated": "2024-06-30 12:00:00"}]
+        slugs, requested = self._crawl_plugins(updated + listing, state)
+        assert requested == [2, 3, 4, 5, 6]
+        assert slugs == ["p4", "p5", "p6", "p7", "p8", "p9"]
+
+    def test_resumed_crawl_steps_back_when_listing_shrank(self):
+        """Test the crawl steps back to the anchor when its page is now empty."""
+        listing = self._plugin_listing(10)
+        state: dict = {}
+        self._crawl_plugins(listing, state, fail_at_page=4)
+
+        slugs, requested = self._crawl_plugins(listing[2:4], state)
+        assert requested == [2, 1]
+        assert slugs == []
+
+    def test_resumed_crawl_restarts_without_anchor(self):
+        """Test the crawl restarts from the first page when the anchor is gone."""
+        listing = self._plugin_listing(10)
+        state: dict = {}
+        self._crawl_plugins(listing, state, fail_at_page=4)
+
+        slugs, requested = self._crawl_plugins(listing[:2], state)
+        assert requested == [2, 1, 1]
+        assert slugs == ["p0", "p1"]
+
+    def test_interrupted_patterns_crawl_resumes_from_offset(self):
+        """Test a resumed patterns crawl continues after the resumed offset."""
+        state: dict = {}
+        requested: list = []
+
+        def crawl(fail_at_offset=None):
+            tap_mock = Mock()
+            tap_mock.config = {**self.config, "pagination_checkpoint_pages": 2}
+            tap_mock.state = state
+            stream = PatternsStream(tap=tap_mock)
+            stream.per_page = 2
+
+            def fake_request(prepared_request, context):
+                query = parse_qs(urlparse(prepared_request.url).query)
+                offset = int(query.get("offset", ["0"])[0])
+                requested.append(offset)
+                if offset == fail_at_offset:
+                    raise KeyboardInterrupt
+                response = make_response(
+                    {
+                        "patterns": [
+                            {"id": i} for i in range(offset, min(offset + 2, 10))
+                        ]
+                    }
+                )
+                response.headers["X-WP-Total"] = "10"
+                return response
+
+            stream._request = fake_request
+            ids = []
+            try:
+                for record in stream.get_records(None):
+                    ids.append(record["id"])
+            except KeyboardInterrupt:
+                pass
+            return ids
+
+        assert crawl(fail_at_offset=6) == [0, 1, 2, 3, 4, 5]
+        assert state["bookmarks"]["patterns"]["pagination_cursor"]["offset"] == 4
+
+        requested.clear()
+        assert crawl() == [4, 5, 6, 7, 8, 9]
+        assert requested == [2, 4, 6, 8]
+        assert "pagination_cursor" not in state["bookmarks"]["patterns"]
+
+    def test_state_writes_hold_state_lock(self):
+        """Test every write to the shared tap state holds the state lock."""
+
+        class TrackingLock:
+            depth = 0
+
+            def __enter__(self):
+                self.depth += 1
+
+            def __exit__(self, *exc_info):
+                self.depth -= 1
+
+        lock = TrackingLock()
+        held = []
+
+        class TrackingState(dict):
+            def __setitem__(self, key, value):
+                held.append(lock.depth > 0)
+                super().__setitem__(key, value)
+
+        tap_mock = Mock()
+        tap_mock.config = {**self.config, "pagination_checkpoint_pages": 1}
+        tap_mock.state = {"bookmarks": {"plugins": TrackingState()}}
+        stream = PluginsStream(tap=tap_mock)
+        stream._state_lock = lock
+        stream._write_state_message = Mock()
+        stream._last_page_record = {"slug": "akismet", "last_updated": "2024-06-01"}
+
+        stream._write_starting_replication_value(None)
+        stream._checkpoint(None, 1, 2)
+        stream._finalize_state(stream.stream_state)
+        assert len(held) >= 2 and all(held)
+
+    def test_plugin_slug_lookups(self):
+        """Test watched slugs are looked up concurrently and kept in order."""
+        tap_mock = Mock()
+        tap_mock.config = {
+            **self.config,
+            "plugin_slugs": ["akismet", "missing", "jetpack"],
+            "max_concurrency": 3,
+        }
+        stream = PluginsStream(tap=tap_mock)
+        stream._rate_limiter = Mock(acquire=Mock(return_value=0.0))
+        stream.get_starting_replication_key_value = Mock(
+            return_value="2099-01-01 1:00pm GMT"
+        )
+
+        def send(prepared_request, context, stream=False):
+            query = parse_qs(urlparse(prepared_request.url).query)
+            assert query["action"] == ["plugin_information"]
+            slug = query["slug"][0]
+            if slug == "missing":
+                return make_response({"error": "Plugin not found."}, status_code=404)
+            return make_response(
+                {
+                    "slug": slug,
+                    "name": f"{slug} &amp; more",
+                    "last_updated": "2024-06-01 1:00pm GMT",
+                }
+            )
+
+        with patch.object(stream, "_send", side_effect=send):
+            records = [
+                stream.post_process(record, None)
+                for record in stream.request_records(None)
+            ]
+
+        # Watched records are emitted whatever the bookmark
+        assert [record["slug"] for record in records] == ["akismet", "jetpack"]
+        assert records[0]["name"] == "akismet & more"
+
+    def test_slug_lookups_keep_listing_bookmark(self):
+        """Test watched records do not advance the full listing's bookmark."""
+        tap_mock = Mock()
+        tap_mock.config = {**self.config, "plugin_slugs": ["akismet"]}
+        tap_mock.state = {}
+        stream = PluginsStream(tap=tap_mock)
+
+        stream._increment_stream_state(
+            {"slug": "akismet", "last_updated": "2024-06-01 1:00pm GMT"},
+            context=None,
+        )
+        stream.finalize_state_progress_markers()
+
+        state = tap_mock.state.get("bookmarks", {}).get("plugins", {})
+        assert "replication_key_value" not in state
+
+    def test_bookmark_stored_as_iso_timestamp(self):
+        """Test bookmarks keep the latest time, not the largest API string."""
+        tap_mock = Mock()
+        tap_mock.config = self.config
+        tap_mock.state = {}
+        stream = PluginsStream(tap=tap_mock)
+
+        for last_updated in ("2024-06-01 10:00pm GMT", "2024-06-01 9:00am GMT"):
+            stream._increment_stream_state(
+                {"slug": "akismet", "last_updated": last_updated}, context=None
+            )
+        stream.finalize_state_progress_markers()
+
+        state = tap_mock.state["bookmarks"]["plugins"]
+        assert state["replication_key_value"] == "2024-06-01T22:00:00+00:00"
+        assert stream.get_starting_timestamp(None) == datetime(
+            2024, 6, 1, 22, tzinfo=timezone.utc
+        )
+
+    def test_theme_slug_lookup_params(self):
+        """Test themes are looked up with theme_information."""
+        tap_mock = Mock()
+        tap_mock.config = {**self.config, "theme_slugs": ["astra"]}
+        stream = ThemesStream(tap=tap_mock)
+
+        assert stream.lookup_slugs == ["astra"]
+        assert stream.get_lookup_params("astra") == {
+            "action": "theme_information",
+            "request[slug]": "astra",
+            "request[fields][last_updated]": "true",
+        }
+
+    def test_entity_decoding_fields(self):
+        """Test entities are decoded in the configured fields only."""
+        row = {
+            "slug": "test",
+            "name": "SEO &#8220;Pro&#8221;",
+            "author": '<a href="https://example.com/?a=1&amp;b=2">Jo &amp; Al</a>',
+            "sections": {"description": "<p>Fast &amp; small</p>"},
+        }
+
+        tap_mock = Mock()
+        tap_mock.config = self.config
+        result = PluginsStream(tap=tap_mock).post_process(dict(row))
+        assert result["name"] == "SEO “Pro”"
+        # Markup fields keep their escaped attribute values
+        assert result["author"] == row["author"]
+        assert result["sections"] == row["sections"]
+
+        tap_mock.config = {**self.config, "decode_entities_fields": ["sections"]}
+        result = PluginsStream(tap=tap_mock).post_process(dict(row))
+        assert result["name"] == row["name"]
+        assert result["sections"] == {"description": "<p>Fast & small</p>"}
+
+    def test_record_pipeline_compiled_at_init(self):
+        """Test each stream compiles only the transformations it declares."""
+        tap_mock = Mock()
+        tap_mock.config = self.config
+
+        plugins = PluginsStream(tap=tap_mock)
+        assert len(plugins.record_pipeline.transforms) == 4
+
+        assert EventsStream(tap=tap_mock).record_pipeline.transforms == ()
+
 
 if __name__ == "__main__":
     pytest.main([__file__])
@@ -1,8 +1,15 @@
 """Test tap functionality."""
 
+import json
+import logging
+import threading
+from datetime import datetime, timezone
 from unittest.mock import patch
 
 import pytest
+import requests
+from singer_sdk.singerlib import RecordMessage
+from singer_sdk.streams import Stream
 
 from tap_wordpress_org.tap import TapWordPressOrg
 
@@ -23,6 +30,7 @@ def test_stream_discovery():
     stream_names = [stream.name for stream in streams]
     expected_streams = [
         "plugins",
+        "plugin_downloads",
         "themes",
         "events",
         "patterns",
@@ -106,8 +114,8 @@ def test_stream_selection_all_streams():
     tap = TapWordPressOrg(config=config)
     streams = tap.discover_streams()
 
-    # Should return all 8 streams
-    assert len(streams) == 8
+    # Should return all 9 streams
+    assert len(streams) == 9
 
 
 def test_incremental_config():
@@ -140,5 +148,180 @@ def test_new_config_options():
     )
 
 
+def test_streams_share_rate_limiter():
+    """Test all streams share one tap-level rate limiter."""
+    tap = TapWordPressOrg(config={"requests_per_second": 5})
+    limiters = {id(stream.rate_limiter) for stream in tap.discover_streams()}
+
+    assert len(limiters) == 1
+
+
+def test_message_writer_json_backend():
+    """Test the message writer serializes records with the configured backend."""
+    message = RecordMessage(
+        stream="plugins",
+        record={"slug": "test-plugin", "rating": 4.5},
+        time_extracted=datetime(2024, 1, 1, tzinfo=timezone.utc),
+    )
+
+    lines = []
+    for backend in ["json", "auto"]:
+        tap = TapWordPressOrg(config={"json_backend": backend})
+        lines.append(json.loads(tap.message_writer.serialize_message(message)))
+
+    assert lines[0] == lines[1]
+    assert lines[0]["record"]["slug"] == "test-plugin"
+    assert lines[0]["time_extracted"] == "2024-01-01T00:00:00+00:00"
+
+
+def _deselect(catalog: dict, stream_name: str, *properties: str) -> dict:
+    for entry in catalog["streams"]:
+        if entry["tap_stream_id"] != stream_name:
+            continue
+        for metadata in entry["metadata"]:
+            if metadata["breadcrumb"][1:] and metadata["breadcrumb"][1] in properties:
+                metadata["metadata"]["selected"] = False
+    return catalog
+
+
+def test_field_projection_follows_catalog_selection():
+    """Test that only selections differing from the API defaults are sent."""
+    catalog = TapWordPressOrg(config={}).catalog_dict
+    _deselect(catalog, "plugins", "sections", "downloaded", "slug", "last_updated")
+    _deselect(catalog, "themes", "rating", "last_updated")
+    tap = TapWordPressOrg(config={"field_projection": True}, catalog=catalog)
+
+    plugins = tap.streams["plugins"]
+    params = plugins.get_url_params(context={}, next_page_token=None)
+    assert params["fields[downloaded]"] == "false"
+    assert params["fields[versions]"] == "true"
+    # Fields matching the listing defaults are left out
+    assert "fields[sections]" not in params
+    assert "fields[name]" not in params
+    # Keys and bookmarks are always requested
+    assert "fields[slug]" not in params
+    assert "fields[last_updated]" not in params
+    # Lookups return sections by default, so they are turned off
+    params = plugins.get_lookup_params("akismet")
+    assert params["fields[sections]"] == "false"
+    assert "fields[versions]" in params
+
+    themes = tap.streams["themes"]
+    params = themes.get_url_params(context={}, next_page_token=None)
+    assert params["request[fields][sections]"] == "true"
+    assert params["request[fields][rating]"] == "false"
+    assert params["request[fields][last_updated]"] == "true"
+    params = themes.get_lookup_params("astra")
+    assert "request[fields][sections]" not in params
+
+
+def test_field_projection_disabled_by_default():
+    """Test that no field params are sent unless projection is enabled."""
+    tap = TapWordPressOrg(config={})
+    params = tap.streams["plugins"].get_url_params(context={}, next_page_token=None)
+    assert not any(name.startswith("fields[") for name in params)
+
+
+def test_streams_sync_concurrently(capsys):
+    """Test streams overlap while each writes SCHEMA before its records."""
+    tap = TapWordPressOrg(
+        config={
+            "stream_selection": ["wordpress_stats", "php_stats", "mysql_stats"],
+            "max_stream_concurrency": 3,
+        }
+    )
+    barrier = threading.Barrier(3, timeout=5)
+
+    def get_records(context):
+        # Every stream must be running at once to get past the barrier
+        barrier.wait()
+        yield {"version": "1.0", "count": 1, "percent": 100.0}
+
+    for stream in tap.streams.values():
+        stream.get_records = get_records
+    tap.sync_streams()
+
+    messages = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    for name in ("wordpress_stats", "php_stats", "mysql_stats"):
+        types = [m["type"] for m in messages if m.get("stream") == name]
+        assert types == ["SCHEMA", "RECORD"]
+    assert messages[-1]["type"] == "STATE"
+    assert set(messages[-1]["value"]["bookmarks"]) == {
+        "wordpress_stats",
+        "php_stats",
+        "mysql_stats",
+    }
+
+
+def test_plugin_downloads_batched_per_plugin(capsys):
+    """Test download histories are prefetched in batches of child contexts."""
+    config = {"child_batch_size": 2, "max_concurrency": 2, "request_delay": 0}
+    catalog = TapWordPressOrg(config=config).catalog_dict
+    for entry in catalog["streams"]:
+        if entry["tap_stream_id"] in ("plugins", "plugin_downloads"):
+            for metadata in entry["metadata"]:
+                if not metadata["breadcrumb"]:
+                    metadata["metadata"]["selected"] = True
+    tap = TapWordPressOrg(config=config, catalog=catalog)
+    tap.streams["plugins"].request_records = lambda context: iter(
+        {"slug": f"plugin-{i}", "last_updated": "2024-06-01", "downloaded": i}
+        for i in range(3)
+    )
+    downloads = tap.streams["plugin_downloads"]
+    batches = []
+    prefetch = downloads.prefetch
+    downloads.prefetch = lambda contexts: batches.append(
+        [c["slug"] for c in contexts]
+    ) or prefetch(contexts)
+
+    def send(prepared_request, **kwargs):
+        response = requests.Response()
+        response.status_code = 200
+        response.url = prepared_request.url
+        response._content = b'{"2024-06-01": "3"}'
+        return response
+
+    with patch.object(requests.Session, "send", side_effect=send):
+        tap.sync_all()
+
+    assert batches == [["plugin-0", "plugin-1"], ["plugin-2"]]
+    messages = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    slugs = [
+        m["record"]["slug"]
+        for m in messages
+        if m["type"] == "RECORD" and m["stream"] == "plugin_downloads"
+    ]
+    assert slugs == ["plugin-0", "plugin-1", "plugin-2"]
+
+
+def test_sync_end_closes_shared_session(caplog):
+    """Test the SDK's own sync loop logs pool stats and closes the session."""
+    tap = TapWordPressOrg(config={"stream_selection": ["php_stats", "mysql_stats"]})
+    for stream in tap.streams.values():
+        stream.get_records = lambda context: iter(())
+
+    with patch.object(tap.http_session, "close") as close:
+        with caplog.at_level(logging.INFO):
+            tap.sync_all()
+
+    close.assert_called_once()
+    assert any("HTTP connection pool" in r.getMessage() for r in caplog.records)
+
+
+def test_state_writers_exist():
+    """Test the SDK still has the private state writers the streams lock.
+
+    The pin on singer-sdk depends on these; an upgrade that renames them
+    would silently drop the state lock.
+    """
+    for name in (
+        "_increment_stream_state",
+        "_write_starting_replication_value",
+        "_finalize_state",
+        "_write_state_message",
+    ):
+        assert callable(getattr(Stream, name, None)), name
+
+
 if __name__ == "__main__":
     pytest.main([__file__])
@@ -0,0 +1,112 @@
+"""Test record transformations."""
+
+import html
+
+from tap_wordpress_org.transforms import (
+    TransformPipeline,
+    decode_entities,
+    decode_fields,
+    false_to_null,
+    require_fields,
+    zero_dates_to_null,
+)
+
+
+def test_decode_entities_strings():
+    """Test every named and numeric entity is decoded in one pass."""
+    assert decode_entities("Tools &#8211; SEO &amp; more") == "Tools – SEO & more"
+    assert decode_entities("It&#8217;s &quot;fast&quot; &hellip;") == ('It’s "fast" …')
+    assert decode_entities("no entities") == "no entities"
+
+
+def test_decode_entities_matches_html_unescape():
+    """Test decoding matches html.unescape, including malformed entities."""
+    for text in ["&amp;lt; &amp;#8211;", "&ampfoo &copy", "&#x41;&#0;&bogus;", "&"]:
+        assert decode_entities(text) == html.unescape(text)
+
+
+def test_decode_entities_nested_values():
+    """Test strings inside objects and lists are decoded, other values kept."""
+    value = {
+        "description": "<p>Fast &amp; small</p>",
+        "tags": ["a &amp; b", 3],
+        "enabled": False,
+    }
+
+    assert decode_entities(value) == {
+        "description": "<p>Fast & small</p>",
+        "tags": ["a & b", 3],
+        "enabled": False,
+    }
+    assert decode_entities(None) is None
+
+
+def make_pipeline(missing: list) -> TransformPipeline:
+    """Return a pipeline like the plugins stream one, recording skipped rows."""
+    return TransformPipeline(
+        [
+            require_fields(("slug",), lambda row, field: missing.append(field)),
+            decode_fields(("name",)),
+            false_to_null(("requires_php", "tested")),
+            zero_dates_to_null(("last_updated",)),
+        ]
+    )
+
+
+def test_pipeline_applies_transforms_in_order():
+    """Test a record goes through every compiled transform."""
+    missing: list = []
+    row = make_pipeline(missing)(
+        {
+            "slug": "a",
+            "name": "A &amp; B",
+            "requires_php": False,
+            "tested": "6.5",
+            "last_updated": "0000-00-00 00:00:00",
+        }
+    )
+
+    assert row == {
+        "slug": "a",
+        "name": "A & B",
+        "requires_php": None,
+        "tested": "6.5",
+        "last_updated": None,
+    }
+    assert missing == []
+
+
+def test_pipeline_drops_records_missing_required_fields():
+    """Test records without a required field are dropped and reported."""
+    missing: list = []
+    pipeline = make_pipeline(missing)
+
+    assert pipeline({"name": "No slug"}) is None
+    assert missing == ["slug"]
+
+
+def test_pipeline_skips_empty_transforms():
+    """Test transforms without fields are left out of the compiled list."""
+    pipeline = TransformPipeline(
+        [require_fields((), print), decode_fields(("name",)), false_to_null(())]
+    )
+
+    assert len(pipeline.transforms) == 1
+    assert TransformPipeline([])({"slug": "a"}) == {"slug": "a"}
+
+
+def test_pipeline_over_page():
+    """Test a page of records is transformed and filtered record by record."""
+    missing: list = []
+    rows = [
+        {"slug": "a", "name": "A &amp; B", "requires_php": False},
+        {"name": "No slug"},
+        {"slug": "c", "last_updated": "0000-00-00 00:00:00"},
+    ]
+
+    pipeline = make_pipeline(missing)
+    assert [row for row in map(pipeline, rows) if row is not None] == [
+        {"slug": "a", "name": "A & B", "requires_php": None},
+        {"slug": "c", "last_updated": None},
+    ]
+    assert missing == ["slug"]